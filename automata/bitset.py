@@ -0,0 +1,102 @@
+"""Utilidades para representar conjuntos de estados como enteros (bitsets)"""
+
+# Índices de los bits encendidos de cada valor de un byte
+_BYTE_BITS = [tuple(i for i in range(8) if value >> i & 1) for value in range(256)]
+
+# Máximo de bits encendidos para extraerlos uno a uno en lugar de recorrer los bytes
+MAX_SPARSE_BITS = 48
+
+def iter_bits(mask):
+    """Retorna la lista de índices de los bits encendidos de un entero, de menor a mayor"""
+    # En un entero ancho con pocos bits encendidos (como los estados de un literal largo)
+    # se aísla el bit más bajo en cada paso: el costo depende de los bits encendidos y no
+    # de recorrer en Python todos los bytes vacíos
+    if mask.bit_count() <= min(MAX_SPARSE_BITS, mask.bit_length() >> 5):
+        indices = []
+        while mask:
+            lowest = mask & -mask
+            indices.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return indices
+    
+    indices = []
+    base = 0
+    for byte in mask.to_bytes((mask.bit_length() + 7) // 8, 'little'):
+        if byte:
+            for i in _BYTE_BITS[byte]:
+                indices.append(base + i)
+        base += 8
+    return indices
+
+def mask_from_states(states):
+    """Construye el bitset correspondiente a un conjunto de ids de estado"""
+    mask = 0
+    for state_id in states:
+        mask |= 1 << state_id
+    return mask
+
+def closure_masks(adjacency):
+    """
+    Calcula, para cada nodo de un grafo dado como listas de adyacencia, el bitset de los
+    nodos alcanzables (incluido él mismo). Las componentes fuertemente conexas (por ejemplo,
+    ciclos de transiciones epsilon creados por cerraduras anidadas) se colapsan con el
+    algoritmo de Tarjan, de modo que todos sus nodos comparten el mismo bitset.
+    """
+    size = len(adjacency)
+    closures = [0] * size
+    order = [-1] * size
+    lowlink = [0] * size
+    on_stack = [False] * size
+    scc_stack = []
+    counter = 0
+    
+    for root in range(size):
+        if order[root] != -1:
+            continue
+        
+        # Tarjan iterativo: pila de (nodo, índice de la siguiente arista)
+        work = [(root, 0)]
+        order[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack[root] = True
+        
+        while work:
+            node, edge = work[-1]
+            edges = adjacency[node]
+            if edge < len(edges):
+                work[-1] = (node, edge + 1)
+                target = edges[edge]
+                if order[target] == -1:
+                    order[target] = lowlink[target] = counter
+                    counter += 1
+                    scc_stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, 0))
+                elif on_stack[target]:
+                    lowlink[node] = min(lowlink[node], order[target])
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            
+            if lowlink[node] == order[node]:
+                # Las componentes salen en orden topológico inverso: sus sucesores ya están listos
+                members = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack[member] = False
+                    members.append(member)
+                    if member == node:
+                        break
+                
+                closure = mask_from_states(members)
+                for member in members:
+                    for target in adjacency[member]:
+                        closure |= closures[target]
+                for member in members:
+                    closures[member] = closure
+    
+    return closures
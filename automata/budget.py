@@ -0,0 +1,175 @@
+"""
+Presupuestos de la determinización y estimación barata del tamaño del AFD.
+
+La construcción de subconjuntos puede crear un número exponencial de estados (por ejemplo
+con '(a|b)*a(a|b)(a|b)...'). Un CompileBudget limita el número de estados, de transiciones
+y el tiempo que puede tomar; si se supera, la construcción se detiene con
+DeterminizationBudgetExceeded y el llamador puede usar un motor que no determiniza.
+"""
+import time
+
+from .regex_ast import Concat, Alt, Repeat, Symbol, fold, parse_postfix, simplify
+from .charclass import CharClass, is_class_token
+
+# Límite del exponente de la estimación (2^64 ya es "infinito" para cualquier presupuesto)
+MAX_ESTIMATE_BITS = 64
+
+class DeterminizationBudgetExceeded(Exception):
+    """La determinización superó el presupuesto de estados, transiciones o tiempo"""
+    def __init__(self, reason, states=0, transitions=0):
+        self.reason = reason            # 'estimate', 'states', 'transitions' o 'deadline'
+        self.states = states
+        self.transitions = transitions
+        super().__init__(
+            f"Se superó el presupuesto de determinización ({reason}): "
+            f"{states} estados, {transitions} transiciones")
+    
+    def __reduce__(self):
+        # Para que el mensaje se reconstruya igual al cruzar procesos (ProcessPoolExecutor)
+        return (self.__class__, (self.reason, self.states, self.transitions))
+
+class CompileBudget:
+    """Límites de la compilación de una expresión (None = sin límite)"""
+    __slots__ = ('max_states', 'max_transitions', 'timeout')
+    
+    def __init__(self, max_states=10000, max_transitions=250000, timeout=5.0):
+        self.max_states = max_states
+        self.max_transitions = max_transitions
+        self.timeout = timeout              # segundos
+    
+    def deadline(self):
+        """Retorna el instante (time.perf_counter) en que vence el tiempo, o None"""
+        if self.timeout is None:
+            return None
+        return time.perf_counter() + self.timeout
+    
+    def check_estimate(self, postfix):
+        """Lanza DeterminizationBudgetExceeded si la estimación del AFD supera el límite de estados"""
+        if self.max_states is None:
+            return
+        estimate = estimate_dfa_states(postfix)
+        if estimate > self.max_states:
+            raise DeterminizationBudgetExceeded('estimate', states=estimate)
+
+def _token_chars(token):
+    """Retorna (conjunto de caracteres, si está negado) de un token"""
+    if is_class_token(token):
+        char_class = CharClass.parse(token)
+        return char_class.chars, char_class.negated
+    return frozenset(token), False
+
+def _char_set(symbols):
+    """
+    Retorna el conjunto de caracteres que acepta algún token de 'symbols', como
+    (caracteres, negado): si está negado son los caracteres excluidos
+    """
+    included = set()
+    excluded = None
+    for token in symbols:
+        chars, negated = _token_chars(token)
+        if negated:
+            excluded = set(chars) if excluded is None else excluded & chars
+        else:
+            included |= chars
+    if excluded is not None:
+        return frozenset(excluded - included), True
+    return frozenset(included), False
+
+def _overlaps(symbols, other):
+    """Indica si dos conjuntos de tokens pueden aceptar un mismo carácter"""
+    if not symbols or not other:
+        return False
+    chars, negated = _char_set(symbols)
+    other_chars, other_negated = _char_set(other)
+    if negated and other_negated:
+        return True
+    if negated:
+        return not other_chars <= chars
+    if other_negated:
+        return not chars <= other_chars
+    return not chars.isdisjoint(other_chars)
+
+def _estimate(node, items):
+    """
+    Retorna (estimación de estados, largo máximo de las cadenas o None si no está acotado,
+    tokens, tokens con los que puede empezar, tokens con los que puede terminar, si acepta
+    la cadena vacía) de un nodo del AST a partir de los valores de sus hijos (ver fold).
+    """
+    if isinstance(node, Symbol):
+        return 1, 1, {node.token}, {node.token}, {node.token}, False
+    
+    if isinstance(node, Repeat):
+        estimate, length, symbols, first, last, nullable = items[0]
+        return (estimate, length if node.op == '?' else None, symbols, first, last,
+                nullable or node.op != '+')
+    
+    if isinstance(node, Alt):
+        estimate, length, symbols, first, last, nullable = 0, 0, set(), set(), set(), False
+        for item_estimate, item_length, item_symbols, item_first, item_last, item_nullable in items:
+            estimate += item_estimate
+            length = None if length is None or item_length is None else max(length, item_length)
+            symbols |= item_symbols
+            first |= item_first
+            last |= item_last
+            nullable = nullable or item_nullable
+        return estimate, length, symbols, first, last, nullable
+    
+    if isinstance(node, Concat):
+        parts = items
+        estimate = sum(part[0] for part in parts)
+        
+        # Después de un ciclo, el AFD debe recordar en qué posiciones de lo que sigue (hasta
+        # el próximo ciclo) hay una coincidencia en curso. Una coincidencia nueva solo empieza
+        # después de un carácter con el que puede terminar una vuelta del ciclo, y el ciclo
+        # muere con el primer carácter que no acepta. Las posiciones que aceptan exactamente
+        # los mismos caracteres que el inicio avanzan o mueren todas juntas (como en KMP y en
+        # '[0-9]*[0-9][0-9]'), por lo que bastan w estados para una ventana de largo w; solo
+        # una posición que acepta parte de los caracteres del inicio obliga a recordar
+        # subconjuntos de coincidencias, hasta 2^w estados
+        for i, (_, length, loop_symbols, _, loop_last, _) in enumerate(parts):
+            if length is not None or i + 1 == len(parts):
+                continue
+            start = set()
+            for part in parts[i + 1:]:
+                start |= part[3]
+                if not part[5]:
+                    break
+            start_chars = _char_set(start)
+            
+            window = 0
+            ambiguous_window = 0
+            for _, tail_length, symbols, first, _, _ in parts[i + 1:]:
+                if tail_length is None or not _overlaps(loop_symbols, symbols):
+                    break
+                window += tail_length
+                if (_overlaps(symbols, loop_last) and _overlaps(first, start)
+                        and _char_set(first) != start_chars):
+                    ambiguous_window = window
+            if window:
+                estimate += max(window, 1 << min(ambiguous_window, MAX_ESTIMATE_BITS))
+        
+        length = 0
+        symbols, first, last = set(), set(), set()
+        for _, part_length, part_symbols, _, _, _ in parts:
+            length = None if length is None or part_length is None else length + part_length
+            symbols |= part_symbols
+        for part in parts:
+            first |= part[3]
+            if not part[5]:
+                break
+        for part in reversed(parts):
+            last |= part[4]
+            if not part[5]:
+                break
+        return estimate, length, symbols, first, last, all(part[5] for part in parts)
+    
+    return 0, 0, set(), set(), set(), True
+
+def estimate_dfa_states(postfix):
+    """
+    Estima (sin construir ningún autómata) el número de estados del AFD de una expresión
+    en notación postfix. Es una cota aproximada y barata, lineal en el tamaño del AST,
+    pensada para descartar de antemano las expresiones con crecimiento exponencial.
+    """
+    estimate = fold(simplify(parse_postfix(postfix)), _estimate)[0]
+    return estimate + 1
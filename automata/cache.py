@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import threading
+
+class LRUCache:
+    """Caché acotada con política de reemplazo LRU (menos usado recientemente)"""
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("El tamaño máximo de la caché debe ser al menos 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def get(self, key, default=None):
+        """Obtiene un valor de la caché y lo marca como usado recientemente"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        """Guarda un valor en la caché, desalojando el menos usado si está llena"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+    
+    def resize(self, maxsize):
+        """Cambia el tamaño máximo de la caché, desalojando entradas si es necesario"""
+        if maxsize < 1:
+            raise ValueError("El tamaño máximo de la caché debe ser al menos 1")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+    
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self):
+        """Retorna los contadores de la caché"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+    
+    def _evict(self):
+        """Desaloja entradas hasta respetar el tamaño máximo (requiere el lock)"""
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
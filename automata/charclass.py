@@ -0,0 +1,204 @@
+"""
+Clases de caracteres ([a-z0-9], [^abc], [^]) y compresión del alfabeto en clases de equivalencia.
+
+Una clase entre corchetes se trata como un único átomo de la expresión regular y se
+convierte en una sola transición del AFN etiquetada con el conjunto de caracteres, en lugar
+de una cadena de uniones con una transición por carácter. Como '.' es el operador de
+concatenación en esta gramática, el comodín "cualquier carácter" se escribe '[^]'.
+
+Antes de determinizar, el alfabeto se divide en clases de equivalencia: dos caracteres son
+equivalentes si pertenecen exactamente a las mismas etiquetas del AFN, por lo que ningún
+autómata derivado puede distinguirlos. Las transiciones del AFN se reetiquetan con una
+etiqueta por clase y la tabla del AFD queda indexada por clase en lugar de por carácter.
+"""
+
+def split_tokens(regex):
+    """
+    Divide una expresión regular en tokens: cada clase entre corchetes es un solo token
+    y cualquier otro carácter es un token por sí mismo.
+    """
+    tokens = []
+    i = 0
+    n = len(regex)
+    
+    while i < n:
+        if regex[i] == '[':
+            # El primer ']' cierra la clase, por lo que ']' no puede formar parte de ella
+            end = regex.find(']', i + 1)
+            if end == -1:
+                raise ValueError("Clase de caracteres sin cerrar")
+            tokens.append(regex[i:end + 1])
+            i = end + 1
+        else:
+            tokens.append(regex[i])
+            i += 1
+    
+    return tokens
+
+def is_class_token(token):
+    """Indica si un token corresponde a una clase de caracteres entre corchetes"""
+    return len(token) > 1 and token[0] == '['
+
+def _describe(chars):
+    """Describe un conjunto de caracteres agrupando los rangos consecutivos (a-z)"""
+    codes = sorted(ord(char) for char in chars if char != '^')
+    parts = []
+    i = 0
+    while i < len(codes):
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+            j += 1
+        if j - i >= 2:
+            parts.append(f"{chr(codes[i])}-{chr(codes[j])}")
+        else:
+            parts.extend(chr(code) for code in codes[i:j + 1])
+        i = j + 1
+    
+    # '^' al final para que la descripción nunca parezca una clase negada
+    if '^' in chars:
+        parts.append('^')
+    return ''.join(parts)
+
+class CharClass:
+    """Conjunto de caracteres de una clase entre corchetes, posiblemente negada"""
+    __slots__ = ('chars', 'negated', 'text')
+    
+    def __init__(self, chars, negated=False, text=None):
+        self.chars = frozenset(chars)
+        self.negated = negated
+        self.text = text if text is not None else ('[^' if negated else '[') + _describe(self.chars) + ']'
+    
+    @classmethod
+    def parse(cls, token):
+        """Construye la clase a partir de su token ('[a-z0-9]', '[^abc]', '[^]')"""
+        body = token[1:-1]
+        negated = body.startswith('^')
+        if negated:
+            body = body[1:]
+        elif not body:
+            raise ValueError("Clase de caracteres vacía")
+        
+        chars = set()
+        i = 0
+        while i < len(body):
+            # 'x-y' es un rango; un '-' al inicio o al final es literal
+            if i + 2 < len(body) and body[i + 1] == '-':
+                first, last = ord(body[i]), ord(body[i + 2])
+                if first > last:
+                    raise ValueError(f"Rango inválido en clase de caracteres: {body[i:i + 3]}")
+                chars.update(chr(code) for code in range(first, last + 1))
+                i += 3
+            else:
+                chars.add(body[i])
+                i += 1
+        
+        return cls(chars, negated, token)
+    
+    def __contains__(self, char):
+        return (char in self.chars) != self.negated
+    
+    def __eq__(self, other):
+        return isinstance(other, CharClass) and self.chars == other.chars and self.negated == other.negated
+    
+    def __hash__(self):
+        return hash((self.chars, self.negated))
+    
+    def __str__(self):
+        return self.text
+    
+    def __repr__(self):
+        return f"CharClass({self.text!r})"
+
+class SymbolClasses:
+    """
+    Traducción de caracteres a las etiquetas de sus clases de equivalencia.
+    Los caracteres que no aparecen en 'labels' pertenecen a la clase por defecto
+    ('default'), que es None si ninguna transición los acepta.
+    """
+    __slots__ = ('labels', 'default')
+    
+    def __init__(self, labels, default=None):
+        self.labels = labels    # carácter -> etiqueta de su clase (None si ninguna transición lo acepta)
+        self.default = default  # etiqueta de la clase del resto de caracteres
+    
+    def label_of(self, char):
+        """Retorna la etiqueta de la clase de un carácter, o None si no tiene transiciones"""
+        return self.labels.get(char, self.default)
+    
+    def __len__(self):
+        """Número de clases de equivalencia con transiciones"""
+        classes = set(self.labels.values())
+        classes.add(self.default)
+        classes.discard(None)
+        return len(classes)
+
+def _label_contains(label, char):
+    """Indica si una etiqueta del AFN (carácter o CharClass) acepta un carácter"""
+    if isinstance(label, CharClass):
+        return char in label
+    return label == char
+
+def compress_alphabet(nfa):
+    """
+    Reemplaza las etiquetas del AFN por clases de equivalencia de caracteres.
+    
+    Solo hace falta si el AFN tiene alguna transición etiquetada con una CharClass; en ese
+    caso las transiciones se reetiquetan con una etiqueta (str) por clase, el alfabeto pasa
+    a ser el conjunto de clases y se guarda en nfa.symbol_classes la traducción de
+    caracteres a clases. Retorna el SymbolClasses creado, o None si no hubo cambios.
+    """
+    labels = sorted(nfa.alphabet, key=str)
+    if not any(isinstance(label, CharClass) for label in labels):
+        return None
+    
+    # Caracteres mencionados explícitamente; el resto se comporta igual entre sí
+    explicit = set()
+    for label in labels:
+        if isinstance(label, CharClass):
+            explicit |= label.chars
+        else:
+            explicit.add(label)
+    
+    # Firma de un carácter: índices de las etiquetas que lo aceptan
+    default_signature = tuple(i for i, label in enumerate(labels)
+                              if isinstance(label, CharClass) and label.negated)
+    groups = {}
+    for char in sorted(explicit):
+        signature = tuple(i for i, label in enumerate(labels) if _label_contains(label, char))
+        groups.setdefault(signature, []).append(char)
+    
+    class_labels = {}
+    char_labels = {}
+    for signature, chars in groups.items():
+        if signature == default_signature:
+            continue  # Se comportan como los caracteres no mencionados
+        if not signature:
+            label = None  # Ninguna transición acepta estos caracteres
+        else:
+            label = chars[0] if len(chars) == 1 else '[' + _describe(chars) + ']'
+            class_labels[signature] = label
+        for char in chars:
+            char_labels[char] = label
+    
+    default_label = None
+    if default_signature:
+        default_label = '[^' + _describe(char_labels) + ']'
+        class_labels[default_signature] = default_label
+    
+    # Etiquetas de clase que reemplazan a cada etiqueta original
+    expansion = {label: [class_label for signature, class_label in class_labels.items() if i in signature]
+                 for i, label in enumerate(labels)}
+    
+    for state in nfa.states.values():
+        transitions = {}
+        for symbol, targets in state.transitions.items():
+            if symbol == 'ε':
+                transitions.setdefault(symbol, []).extend(targets)
+                continue
+            for class_label in expansion[symbol]:
+                transitions.setdefault(class_label, []).extend(targets)
+        state.transitions = transitions
+    
+    nfa.alphabet = set(class_labels.values())
+    nfa.symbol_classes = SymbolClasses(char_labels, default_label)
+    return nfa.symbol_classes
@@ -0,0 +1,183 @@
+"""
+Generación de código: convierte un AFD compilado en una función de Python especializada.
+
+Cada estado se traduce a un ciclo 'for' sobre un único iterador de la cadena: sus
+transiciones se escriben como comparaciones de caracteres (agrupados por estado destino),
+los caracteres que no cambian el estado continúan el ciclo sin volver al despacho (salto
+rápido sobre las rachas de los ciclos del AFD) y la aceptación al final de la entrada es una
+constante en la rama 'else' del ciclo. Los estados se despachan con un árbol de comparaciones
+binario, por lo que cambiar de estado cuesta O(log n) comparaciones. Si el AFD tiene un
+prefiltro de literales (ver prefilter), sus verificaciones se escriben al inicio de la función.
+
+El código generado se carga con compile/exec y se puede guardar en disco (SourceCache)
+para no regenerarlo en cada arranque. La primera línea del código indica la versión del
+generador; SourceCache descarta los archivos de otra versión.
+"""
+from .serialization import DiskCache
+
+# Versión del generador: debe incrementarse cada vez que cambia el código que se genera
+CODEGEN_VERSION = 1
+VERSION_LINE = f"# codegen {CODEGEN_VERSION}"
+
+def _state_block(compiled, index):
+    """Genera las líneas de código (sin sangría) de un estado del AFD"""
+    width = compiled.width
+    table = compiled.table
+    dead = compiled.dead
+    row = index * width
+    accepting = 'True' if compiled.accepting[index] else 'False'
+    
+    # Agrupar los caracteres por estado destino
+    groups = {}
+    for char, column in compiled.symbol_map.items():
+        groups.setdefault(table[row + column], []).append(char)
+    default_target = table[row + compiled.default_column]
+    
+    if default_target == row and all(target == row for target in groups):
+        # Todo carácter mantiene el estado: el resultado ya no depende del resto
+        return [f"return {accepting}"]
+    
+    # Cada estado consume caracteres en su propio ciclo: los que no cambian el estado
+    # continúan el ciclo (salto rápido) y los demás salen con 'break' hacia el despacho
+    lines = ["for c in chars:"]
+    body = []
+    if row in groups and default_target != row:
+        body.append(f"if {_condition(groups[row])}:")
+        body.append("    continue")
+    
+    branches = [(target, chars) for target, chars in groups.items()
+                if target != default_target and target != row]
+    branches.sort(key=lambda branch: -len(branch[1]))
+    
+    keyword = 'if'
+    for target, chars in branches:
+        body.append(f"{keyword} {_condition(chars)}:")
+        body.extend(_goto(target, dead, width, '    '))
+        keyword = 'elif'
+    
+    if default_target != row:
+        if keyword == 'if':
+            body.extend(_goto(default_target, dead, width))
+        else:
+            body.append("else:")
+            body.extend(_goto(default_target, dead, width, '    '))
+    
+    lines.extend('    ' + line for line in body)
+    lines.append("else:")
+    lines.append(f"    return {accepting}")
+    return lines
+
+def _condition(chars):
+    """Escribe la condición que verifica si el carácter 'c' está en un conjunto"""
+    if len(chars) == 1:
+        return f"c == {chars[0]!r}"
+    return f"c in {''.join(sorted(chars))!r}"
+
+def _goto(target, dead, width, indent=''):
+    """Escribe el cambio al estado destino (o el rechazo si es el estado muerto)"""
+    if target == dead:
+        return [f"{indent}return False"]
+    return [f"{indent}state = {target // width}", f"{indent}break"]
+
+def _prefilter_lines(prefilter):
+    """Genera las verificaciones del prefiltro de literales como condiciones constantes"""
+    if prefilter is None:
+        return []
+    
+    lines = []
+    if prefilter.min_length:
+        lines.append(f"if len(text) < {prefilter.min_length}:")
+        lines.append("    return False")
+    if prefilter.max_length is not None:
+        lines.append(f"if len(text) > {prefilter.max_length}:")
+        lines.append("    return False")
+    if prefilter.prefix:
+        lines.append(f"if not text.startswith({prefilter.prefix!r}):")
+        lines.append("    return False")
+    if prefilter.suffix:
+        lines.append(f"if not text.endswith({prefilter.suffix!r}):")
+        lines.append("    return False")
+    for literal in prefilter.required:
+        lines.append(f"if {literal!r} not in text:")
+        lines.append("    return False")
+    return lines
+
+def _dispatch(states, blocks, indent):
+    """Genera un árbol binario de comparaciones que despacha al bloque del estado actual"""
+    pad = ' ' * indent
+    if len(states) == 1:
+        return [pad + line for line in blocks[states[0]]]
+    
+    middle = len(states) // 2
+    lines = [f"{pad}if state < {states[middle]}:"]
+    lines.extend(_dispatch(states[:middle], blocks, indent + 4))
+    lines.append(f"{pad}else:")
+    lines.extend(_dispatch(states[middle:], blocks, indent + 4))
+    return lines
+
+def generate_source(compiled, name='match'):
+    """Genera el código fuente de un módulo con la función 'name(text)' especializada en el AFD"""
+    width = compiled.width
+    dead_index = compiled.dead // width
+    start_index = compiled.start // width
+    header = [
+        VERSION_LINE,
+        '"""Verificador generado automáticamente a partir de un AFD compilado"""',
+        '',
+    ]
+    
+    if start_index == dead_index:
+        return '\n'.join(header + [f"def {name}(text):", "    return False", ""])
+    
+    # Solo los estados alcanzables desde el inicial (sin el estado muerto)
+    seen = {start_index}
+    pending = [start_index]
+    while pending:
+        row = pending.pop() * width
+        for column in range(width):
+            target = compiled.table[row + column] // width
+            if target != dead_index and target not in seen:
+                seen.add(target)
+                pending.append(target)
+    states = sorted(seen)
+    
+    blocks = {index: _state_block(compiled, index) for index in states}
+    
+    body = [f"def {name}(text):"]
+    body.extend('    ' + line for line in _prefilter_lines(compiled.prefilter))
+    body.extend([
+        "    chars = iter(text)",
+        f"    state = {start_index}",
+        "    while True:",
+    ])
+    body.extend(_dispatch(states, blocks, 8))
+    body.append('')
+    
+    return '\n'.join(header + body)
+
+def load_source(source, name='match'):
+    """Compila y ejecuta el código generado; retorna la función 'name'"""
+    namespace = {}
+    exec(compile(source, '<afd generado>', 'exec'), namespace)
+    return namespace[name]
+
+def generate_matcher(compiled, name='match'):
+    """Genera y carga la función especializada de un AFD compilado"""
+    return load_source(generate_source(compiled, name), name)
+
+class SourceCache(DiskCache):
+    """Caché en disco del código generado (ver serialization.DiskCache)"""
+    suffix = '.py'
+    
+    def _load(self, path):
+        """Retorna el código guardado en un archivo, verificando la versión del generador"""
+        with open(path, encoding='utf-8') as file:
+            source = file.read()
+        version_line = source.partition('\n')[0]
+        if version_line != VERSION_LINE:
+            raise ValueError(f"Versión de código generado no soportada: {version_line!r}")
+        return source
+    
+    def _dump(self, source):
+        """Retorna los bytes que se guardan para un código"""
+        return source.encode('utf-8')
@@ -0,0 +1,145 @@
+from array import array
+
+from .bitset import closure_masks
+
+class CompactNFA:
+    """
+    Representación compacta de un AFN basada en arreglos (formato CSR).
+    
+    Las transiciones con símbolo del estado q ocupan las posiciones
+    offsets[q]:offsets[q + 1] de los arreglos edge_symbols y edge_targets; las transiciones
+    epsilon se guardan en una tabla aparte con el mismo esquema. Los símbolos se representan
+    por enteros (índices en 'symbols'). Así cada estado cuesta unos pocos enteros en lugar
+    de un objeto con su propio diccionario de transiciones.
+    """
+    __slots__ = ('symbols', 'symbol_map', 'offsets', 'edge_symbols', 'edge_targets',
+                 'epsilon_offsets', 'epsilon_targets', 'start_state', 'final_states',
+                 'accept_tags', 'alphabet', 'state_counter', 'symbol_classes')
+    
+    def __init__(self, symbols, offsets, edge_symbols, edge_targets, epsilon_offsets, epsilon_targets,
+                 start_state, final_states, accept_tags=None, symbol_classes=None):
+        self.symbols = tuple(symbols)
+        self.symbol_map = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.offsets = offsets
+        self.edge_symbols = edge_symbols
+        self.edge_targets = edge_targets
+        self.epsilon_offsets = epsilon_offsets
+        self.epsilon_targets = epsilon_targets
+        self.start_state = start_state
+        self.final_states = frozenset(final_states)
+        self.accept_tags = dict(accept_tags or {})
+        self.alphabet = set(self.symbols)
+        self.state_counter = len(offsets) - 1
+        self.symbol_classes = symbol_classes
+    
+    @classmethod
+    def from_nfa(cls, nfa):
+        """Convierte un AFN a su representación compacta, renumerando los estados de forma contigua"""
+        state_ids = sorted(nfa.states)
+        index = {state_id: i for i, state_id in enumerate(state_ids)}
+        symbols = sorted(nfa.alphabet)
+        symbol_map = {symbol: i for i, symbol in enumerate(symbols)}
+        
+        offsets = array('i', [0])
+        edge_symbols = array('i')
+        edge_targets = array('i')
+        epsilon_offsets = array('i', [0])
+        epsilon_targets = array('i')
+        
+        for state_id in state_ids:
+            for symbol, targets in nfa.states[state_id].transitions.items():
+                if symbol == 'ε':
+                    epsilon_targets.extend(index[target] for target in targets)
+                else:
+                    for target in targets:
+                        edge_symbols.append(symbol_map[symbol])
+                        edge_targets.append(index[target])
+            offsets.append(len(edge_targets))
+            epsilon_offsets.append(len(epsilon_targets))
+        
+        start_state = index.get(nfa.start_state)
+        final_states = [index[state_id] for state_id in nfa.final_states if state_id in index]
+        accept_tags = {index[state_id]: tag for state_id, tag in nfa.accept_tags.items() if state_id in index}
+        
+        return cls(symbols, offsets, edge_symbols, edge_targets, epsilon_offsets, epsilon_targets,
+                   start_state, final_states, accept_tags, nfa.symbol_classes)
+    
+    @property
+    def num_states(self):
+        """Número de estados del AFN"""
+        return self.state_counter
+    
+    @property
+    def nbytes(self):
+        """Memoria ocupada por los arreglos de transiciones, en bytes"""
+        arrays = (self.offsets, self.edge_symbols, self.edge_targets, self.epsilon_offsets, self.epsilon_targets)
+        return sum(len(a) * a.itemsize for a in arrays)
+    
+    def epsilon_closure(self, states):
+        """Calcula la cerradura epsilon de un conjunto de estados"""
+        offsets = self.epsilon_offsets
+        targets = self.epsilon_targets
+        closure = set(states)
+        stack = list(states)
+        
+        while stack:
+            current = stack.pop()
+            for i in range(offsets[current], offsets[current + 1]):
+                next_state = targets[i]
+                if next_state not in closure:
+                    closure.add(next_state)
+                    stack.append(next_state)
+        
+        return closure
+    
+    def move(self, states, symbol):
+        """Calcula el conjunto de estados alcanzables desde un conjunto de estados con un símbolo"""
+        symbol_id = self.symbol_map.get(symbol)
+        result = set()
+        if symbol_id is None:
+            return result
+        
+        offsets = self.offsets
+        edge_symbols = self.edge_symbols
+        edge_targets = self.edge_targets
+        for state_id in states:
+            for i in range(offsets[state_id], offsets[state_id + 1]):
+                if edge_symbols[i] == symbol_id:
+                    result.add(edge_targets[i])
+        return result
+    
+    def epsilon_closure_masks(self):
+        """Calcula la cerradura epsilon de cada estado como bitset (ver NFA.epsilon_closure_masks)"""
+        offsets = self.epsilon_offsets
+        targets = self.epsilon_targets
+        return closure_masks([targets[offsets[q]:offsets[q + 1]] for q in range(self.state_counter)])
+    
+    def move_masks(self, closures):
+        """Precalcula los pares (símbolo, bitset) de cada estado (ver NFA.move_masks)"""
+        moves = []
+        for state_id in range(self.state_counter):
+            by_symbol = {}
+            for i in range(self.offsets[state_id], self.offsets[state_id + 1]):
+                symbol = self.symbols[self.edge_symbols[i]]
+                by_symbol[symbol] = by_symbol.get(symbol, 0) | closures[self.edge_targets[i]]
+            moves.append(list(by_symbol.items()))
+        return moves
+    
+    def simulate(self, input_string):
+        """Simula el AFN con una cadena de entrada"""
+        if self.start_state is None:
+            return False
+        
+        current_states = self.epsilon_closure({self.start_state})
+        classes = self.symbol_classes
+        
+        for symbol in input_string:
+            if classes is not None:
+                symbol = classes.label_of(symbol)
+            current_states = self.epsilon_closure(self.move(current_states, symbol))
+            
+            if not current_states:
+                return False
+        
+        # Verificar si algún estado actual es final
+        return not self.final_states.isdisjoint(current_states)
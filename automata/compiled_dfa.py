@@ -0,0 +1,249 @@
+from array import array
+
+# match_many avanza varios caracteres por paso mientras las combinaciones de columnas no
+# pasen de MAX_BATCH_CODES y la tabla compuesta no pase de MAX_BATCH_TABLE entradas
+MAX_BATCH_CODES = 256
+MAX_BATCH_TABLE = 1 << 18
+
+class CompiledDFA:
+    """
+    Clase para representar un AFD compilado en una tabla de transiciones densa.
+    
+    Los estados se numeran de forma contigua y los símbolos se traducen a columnas
+    mediante un mapa de enteros. La tabla guarda directamente el desplazamiento de la
+    fila destino (índice_estado * ancho), de modo que cada paso de la simulación es un
+    único acceso a la tabla. La última fila corresponde al estado muerto y la última
+    columna a los símbolos fuera del alfabeto.
+    
+    Los sumideros de aceptación (estados finales de los que ninguna columna sale) se ubican
+    justo antes del estado muerto: todas las filas desde 'terminal' deciden el resultado sin
+    leer el resto de la cadena, y la simulación lo detecta con una sola comparación por paso.
+    """
+    __slots__ = ('table', 'symbol_map', 'width', 'start', 'dead', 'default_column',
+                 'accepting', 'state_ids', 'terminal', 'prefilter', '_batch_tables')
+    
+    def __init__(self, table, symbol_map, width, start, dead, default_column, accepting, state_ids=()):
+        self.table = table                    # array('i') de desplazamientos de fila
+        self.symbol_map = symbol_map          # símbolo -> columna
+        self.width = width                    # número de columnas por fila
+        self.start = start                    # desplazamiento de la fila inicial
+        self.dead = dead                      # desplazamiento de la fila del estado muerto
+        self.default_column = default_column  # columna para símbolos desconocidos
+        self.accepting = accepting            # bytes: 1 si el estado (por índice) es final
+        self.state_ids = state_ids            # índice -> id del estado en el AFD original
+        self.terminal = self._find_terminal()  # primera fila terminal (sumideros y estado muerto)
+        self.prefilter = None                 # Prefilter verificado antes de recorrer la tabla
+        self._batch_tables = None             # tablas de NumPy para match_many (perezosas)
+    
+    @classmethod
+    def from_dfa(cls, dfa):
+        """Compila un AFD (normalmente minimizado) a su representación tabular"""
+        # Los sumideros de aceptación van al final, justo antes del estado muerto
+        sinks = dfa.get_accepting_sinks()
+        state_ids = sorted(state_id for state_id in dfa.states if state_id not in sinks) + sorted(sinks)
+        index = {state_id: i for i, state_id in enumerate(state_ids)}
+        symbols = sorted(dfa.alphabet)
+        columns = {symbol: column for column, symbol in enumerate(symbols)}
+        
+        # Una columna extra para los símbolos que no pertenecen al alfabeto
+        width = len(symbols) + 1
+        default_column = len(symbols)
+        dead = len(state_ids) * width
+        
+        # Con clases de equivalencia las columnas son clases: cada carácter se traduce a la
+        # columna de su clase y la columna por defecto es la de la clase "resto"
+        classes = dfa.symbol_classes
+        if classes is None:
+            symbol_map = columns
+        else:
+            symbol_map = {char: columns.get(label, len(symbols)) for char, label in classes.labels.items()}
+            default_column = columns.get(classes.default, len(symbols))
+        
+        table = array('i', [dead]) * ((len(state_ids) + 1) * width)
+        for state_id in state_ids:
+            row = index[state_id] * width
+            for symbol, target in dfa.states[state_id].transitions.items():
+                if target in index:
+                    table[row + columns[symbol]] = index[target] * width
+        
+        accepting = bytes(1 if state_id in dfa.final_states else 0 for state_id in state_ids) + b'\x00'
+        
+        start = index[dfa.start_state] * width if dfa.start_state in index else dead
+        
+        compiled = cls(table, symbol_map, width, start, dead, default_column, accepting, tuple(state_ids))
+        compiled.prefilter = dfa.prefilter
+        return compiled
+    
+    def _find_terminal(self):
+        """Retorna el desplazamiento de la primera de las filas terminales del final de la tabla"""
+        width = self.width
+        table = self.table
+        # Solo cuentan las columnas a las que se traduce algún carácter
+        columns = set(self.symbol_map.values())
+        columns.add(self.default_column)
+        
+        terminal = self.dead
+        while terminal:
+            row = terminal - width
+            if not self.accepting[row // width] or any(table[row + column] != row for column in columns):
+                break
+            terminal = row
+        return terminal
+    
+    @property
+    def num_states(self):
+        """Número de estados sin contar el estado muerto"""
+        return len(self.accepting) - 1
+    
+    def is_accepting(self, state):
+        """Indica si el desplazamiento de fila dado corresponde a un estado final"""
+        return bool(self.accepting[state // self.width])
+    
+    def match(self, input_string):
+        """Verifica si la cadena completa pertenece al lenguaje"""
+        table = self.table
+        get_column = self.symbol_map.get
+        default_column = self.default_column
+        dead = self.dead
+        terminal = self.terminal
+        state = self.start
+        
+        if self.prefilter is not None and not self.prefilter.check(input_string):
+            return False
+        if state >= terminal:
+            return state != dead
+        
+        for symbol in input_string:
+            state = table[state + get_column(symbol, default_column)]
+            if state >= terminal:
+                # Estado muerto o sumidero de aceptación: el resto de la cadena no importa
+                return state != dead
+        
+        return bool(self.accepting[state // self.width])
+    
+    def _get_batch_tables(self):
+        """
+        Construye (una sola vez) las tablas de NumPy usadas por match_many.
+        
+        La tabla de transiciones tiene una columna más, la de relleno, en la que cada estado
+        vuelve a sí mismo, y se compone consigo misma 'stride' veces: cada columna de la
+        tabla compuesta es una combinación de 'stride' columnas (la primera es la más
+        significativa) y un paso avanza esa cantidad de caracteres. Los desplazamientos de
+        fila usan el ancho de la tabla compuesta.
+        """
+        if self._batch_tables is None:
+            import numpy as np
+            
+            width = self.width
+            padded_width = width + 1
+            single = np.empty((len(self.accepting), padded_width), dtype=np.int32)
+            single[:, :width] = np.asarray(self.table, dtype=np.int32).reshape(-1, width) // width
+            single[:, width] = np.arange(len(single), dtype=np.int32)
+            
+            stride = 1
+            combined = single
+            while (padded_width ** (stride + 1) <= MAX_BATCH_CODES
+                   and len(single) * padded_width ** (stride + 1) <= MAX_BATCH_TABLE):
+                combined = single[combined].reshape(len(single), -1)
+                stride += 1
+            transitions = (combined * combined.shape[1]).ravel()
+            
+            # Tabla de búsqueda densa punto de código -> columna; la última entrada es la
+            # columna por defecto para cualquier carácter fuera del alfabeto
+            codepoints = [ord(symbol) for symbol in self.symbol_map if len(symbol) == 1]
+            column_type = np.uint8 if padded_width <= 256 else np.int32
+            lookup = np.full(max(codepoints, default=-1) + 2, self.default_column, dtype=column_type)
+            for symbol, column in self.symbol_map.items():
+                if len(symbol) == 1:
+                    lookup[ord(symbol)] = column
+            
+            # Para textos Latin-1 cada byte se traduce directamente, sin acotar el punto de
+            # código; si las columnas caben en un byte se usa bytes.translate
+            byte_lookup = lookup[np.minimum(np.arange(256), len(lookup) - 1)]
+            if column_type == np.uint8:
+                byte_lookup = byte_lookup.tobytes()
+            
+            accepting = np.frombuffer(self.accepting, dtype=np.uint8).astype(bool)
+            self._batch_tables = (transitions, stride, lookup, byte_lookup, accepting)
+        return self._batch_tables
+    
+    def match_many(self, strings):
+        """
+        Verifica un lote de cadenas a la vez y retorna un arreglo booleano de NumPy.
+        
+        Las cadenas se agrupan por largo (cada grupo va de un largo a su doble) y cada grupo
+        se copia a una matriz de columnas con una fila por posición, rellenada con la columna
+        que deja el estado igual. Las filas se combinan de a 'stride' (ver _get_batch_tables),
+        así cada paso es una suma y un único acceso indexado a la tabla para todas las cadenas
+        del grupo, sin retirar cadenas ni copiar sus estados. Un grupo se deja de recorrer
+        cuando todas sus cadenas llegaron a un estado terminal.
+        """
+        import numpy as np
+        from numpy.lib.stride_tricks import sliding_window_view
+        
+        strings = list(strings)
+        if not strings:
+            return np.zeros(0, dtype=bool)
+        
+        transitions, stride, lookup, byte_lookup, accepting = self._get_batch_tables()
+        padded_width = self.width + 1
+        row_width = padded_width ** stride
+        start = self.start // self.width * row_width
+        terminal = self.terminal // self.width * row_width
+        
+        lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+        offsets = np.zeros(len(strings), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        
+        # Traducir todos los caracteres a columnas en un solo paso, dejando al final espacio
+        # para que las ventanas de las cadenas más largas no se salgan del búfer
+        text = ''.join(strings)
+        longest = int(lengths.max())
+        try:
+            encoded = text.encode('latin-1')
+            if isinstance(byte_lookup, bytes):
+                flat_columns = np.frombuffer(encoded.translate(byte_lookup), dtype=np.uint8)
+            else:
+                flat_columns = byte_lookup.take(np.frombuffer(encoded, dtype=np.uint8))
+        except UnicodeEncodeError:
+            flat = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+            flat_columns = lookup[np.minimum(flat, len(lookup) - 1)]
+        flat_columns = np.concatenate([flat_columns, np.zeros(longest + stride, dtype=flat_columns.dtype)])
+        
+        # Grupos de largo [0], (0, 8], (8, 16], (16, 32], ...; basta ordenar por grupo
+        bounds = [0]
+        while bounds[-1] < longest:
+            bounds.append(max(bounds[-1] * 2, 8))
+        groups = np.searchsorted(np.array(bounds), lengths).astype(np.uint8)
+        order = np.argsort(groups, kind='stable')
+        sorted_lengths = lengths[order]
+        edges = np.searchsorted(groups[order], np.arange(len(bounds) + 1))
+        
+        final_states = np.full(len(strings), start, dtype=np.int32)
+        for low, high in zip(edges[:-1], edges[1:]):
+            members = order[low:high]
+            member_lengths = sorted_lengths[low:high]
+            steps = -(-int(member_lengths.max(initial=0)) // stride)
+            if not steps:
+                continue
+            
+            # matriz[j, i] = columna del j-ésimo carácter de la cadena i del grupo: se copian
+            # steps * stride columnas desde el inicio de cada cadena y lo que sobra se rellena
+            rows = sliding_window_view(flat_columns, steps * stride)[offsets[members]]
+            np.putmask(rows, np.arange(steps * stride) >= member_lengths[:, None], self.width)
+            matrix = np.ascontiguousarray(rows.T).reshape(steps, stride, len(members))
+            codes = matrix[:, 0]
+            for k in range(1, stride):
+                codes *= padded_width
+                codes += matrix[:, k]
+            
+            states = np.full(len(members), start, dtype=np.int32)
+            for j in range(steps):
+                states += codes[j]
+                transitions.take(states, out=states)
+                # Cada cierto número de pasos revisar si el grupo ya está decidido
+                if j % 8 == 7 and (states >= terminal).all():
+                    break
+            final_states[members] = states
+        
+        return accepting[final_states // row_width]
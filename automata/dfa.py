@@ -1,4 +1,5 @@
 from .state import DFAState
+from .compiled_dfa import CompiledDFA
 
 class DFA:
     """Clase para representar un Autómata Finito Determinista"""
@@ -8,11 +9,16 @@ class DFA:
         self.final_states = set()
         self.alphabet = set()
         self.state_counter = 0
-        self.state_map = {}  # Mapeo de conjuntos de estados del AFN a estados del AFD
+        self.state_map = {}  # Mapeo de conjuntos de estados del AFN (bitsets) a estados del AFD
+        self.state_tags = {}  # Estado final -> frozenset de ids de patrones que acepta
+        self.symbol_classes = None  # Traducción carácter -> clase de equivalencia (ver charclass)
+        self.prefilter = None  # Condiciones necesarias verificadas antes de simular (ver prefilter)
+        self.accepting_sinks = set()  # Estados finales que aceptan cualquier continuación
+        self._compiled = None  # Tabla compilada compartida (ver get_compiled)
     
-    def create_state(self, is_final=False, nfa_states=None):
-        """Crea un nuevo estado"""
-        state = DFAState(self.state_counter, is_final, nfa_states)
+    def create_state(self, is_final=False, nfa_states=None, nfa_mask=0):
+        """Crea un nuevo estado; los estados del AFN se indican como conjunto o como bitset"""
+        state = DFAState(self.state_counter, is_final, nfa_states, nfa_mask)
         self.states[self.state_counter] = state
         if is_final:
             self.final_states.add(self.state_counter)
@@ -38,21 +44,48 @@ class DFA:
         """Simula el AFD con una cadena de entrada"""
         if self.start_state is None:
             return False
+        if self.prefilter is not None and not self.prefilter.check(input_string):
+            return False
         
         current_state = self.start_state
+        classes = self.symbol_classes
+        sinks = self.accepting_sinks
+        if current_state in sinks:
+            return True
         
         for symbol in input_string:
             if current_state is None or current_state not in self.states:
                 return False
             
+            if classes is not None:
+                symbol = classes.label_of(symbol)
+            
             current_state = self.states[current_state].get_transition(symbol)
             
             if current_state is None:
                 return False
+            
+            # Desde un sumidero de aceptación el resto de la cadena ya no cambia el resultado
+            if current_state in sinks:
+                return True
         
         # Verificar si el estado actual es final
         return current_state in self.final_states
     
+    def compile(self):
+        """Compila el AFD a una tabla de transiciones densa para simulaciones rápidas"""
+        return CompiledDFA.from_dfa(self)
+    
+    def get_compiled(self):
+        """
+        Retorna la tabla compilada del AFD, construyéndola solo la primera vez. La tabla se
+        comparte entre todos los llamadores, por lo que el AFD no debe modificarse después
+        (como los AFD de la caché de compilación); compile() siempre construye una nueva.
+        """
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled
+    
     def get_unreachable_states(self):
         """Obtiene los estados inalcanzables desde el estado inicial"""
         if self.start_state is None:
@@ -76,12 +109,52 @@ class DFA:
         # Retornar estados no alcanzables
         return set(self.states.keys()) - reachable
     
+    def get_dead_states(self):
+        """Obtiene los estados desde los que no se alcanza ningún estado final"""
+        predecessors = {}
+        for state_id, state in self.states.items():
+            for next_state in state.transitions.values():
+                predecessors.setdefault(next_state, []).append(state_id)
+        
+        # BFS hacia atrás desde los estados finales
+        alive = {state_id for state_id in self.final_states if state_id in self.states}
+        queue = list(alive)
+        while queue:
+            current = queue.pop()
+            for previous in predecessors.get(current, ()):
+                if previous not in alive:
+                    alive.add(previous)
+                    queue.append(previous)
+        
+        return set(self.states.keys()) - alive
+    
+    def get_accepting_sinks(self):
+        """
+        Obtiene los estados finales que aceptan cualquier continuación: todas sus transiciones,
+        incluida la de los caracteres fuera del alfabeto, vuelven al mismo estado. Sin clases
+        de equivalencia los caracteres fuera del alfabeto no tienen transición, por lo que
+        solo hay sumideros si alguna clase como '[^]' cubre el resto de los caracteres.
+        """
+        classes = self.symbol_classes
+        if classes is None or classes.default not in self.alphabet:
+            return set()
+        if any(label not in self.alphabet for label in classes.labels.values()):
+            return set()
+        
+        sinks = set()
+        for state_id in self.final_states:
+            transitions = self.states[state_id].transitions
+            if all(transitions.get(symbol) == state_id for symbol in self.alphabet):
+                sinks.add(state_id)
+        return sinks
+    
     def remove_states(self, states_to_remove):
         """Elimina un conjunto de estados del AFD"""
         for state_id in states_to_remove:
             if state_id in self.states:
                 if state_id in self.final_states:
                     self.final_states.remove(state_id)
+                self.state_tags.pop(state_id, None)
                 del self.states[state_id]
         
         # Actualizar transiciones para eliminar referencias a estados eliminados
@@ -1,7 +1,7 @@
 from .dfa import DFA
 
 def minimize_dfa(dfa):
-    """Implementa el algoritmo de minimización de AFD mediante partición de estados"""
+    """Implementa el algoritmo de minimización de AFD mediante refinamiento de particiones (Hopcroft)"""
     if not dfa.states or dfa.start_state is None:
         return dfa
     
@@ -10,72 +10,108 @@ def minimize_dfa(dfa):
     if unreachable:
         dfa.remove_states(unreachable)
     
-    # Inicializar particiones: estados finales y no finales
-    final_states = frozenset(dfa.final_states)
-    non_final_states = frozenset(set(dfa.states.keys()) - final_states)
+    # Eliminar estados muertos: sus transiciones pasan a faltar y la simulación termina ahí
+    dead = dfa.get_dead_states()
+    if dead:
+        dfa.remove_states(dead)
     
-    # Partición inicial
-    partitions = []
-    if final_states:
-        partitions.append(final_states)
-    if non_final_states:
-        partitions.append(non_final_states)
-    
-    # Refinar particiones hasta que no haya cambios
-    changed = True
-    while changed:
-        changed = False
-        new_partitions = []
+    # Refinar particiones con el algoritmo de Hopcroft
+    partitions = hopcroft_partitions(dfa)
+    
+    # Construir el AFD minimizado y marcar sus sumideros de aceptación
+    minimized_dfa = build_minimized_dfa(dfa, partitions)
+    minimized_dfa.accepting_sinks = minimized_dfa.get_accepting_sinks()
+    return minimized_dfa
+
+def hopcroft_partitions(dfa):
+    """
+    Calcula la partición de estados equivalentes con el algoritmo de Hopcroft en O(k·n log n).
+    
+    La función de transición se completa con un estado muerto implícito que recibe todas
+    las transiciones faltantes. Se mantiene un índice estado -> bloque y una lista de
+    trabajo de divisores (bloque, símbolo); al dividir un bloque siempre se encola la
+    mitad más pequeña.
+    """
+    state_ids = list(dfa.states)
+    index = {state_id: i for i, state_id in enumerate(state_ids)}
+    dead = len(state_ids)
+    symbols = sorted(dfa.alphabet)
+    
+    # Transiciones inversas: predecessors[símbolo][destino] -> lista de orígenes
+    predecessors = [[[] for _ in range(dead + 1)] for _ in symbols]
+    for state_id in state_ids:
+        transitions = dfa.states[state_id].transitions
+        source = index[state_id]
+        for k, symbol in enumerate(symbols):
+            target = transitions.get(symbol)
+            predecessors[k][index[target] if target in index else dead].append(source)
+    for k in range(len(symbols)):
+        predecessors[k][dead].append(dead)
+    
+    # Partición inicial: estados no finales (incluyendo el estado muerto) y estados finales,
+    # separados además por el conjunto de patrones que aceptan
+    initial = {None: {dead}}
+    for state_id in state_ids:
+        if state_id in dfa.final_states:
+            key = dfa.state_tags.get(state_id, frozenset())
+        else:
+            key = None
+        initial.setdefault(key, set()).add(index[state_id])
+    blocks = list(initial.values())
+    block_of = [0] * (dead + 1)
+    for b, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = b
+    
+    # Encolar todos los bloques iniciales excepto el más grande
+    largest = max(range(len(blocks)), key=lambda b: len(blocks[b]))
+    worklist = [(b, k) for b in range(len(blocks)) if b != largest for k in range(len(symbols))]
+    
+    while worklist:
+        splitter, k = worklist.pop()
+        
+        # Agrupar por bloque los estados que llegan al divisor con el símbolo k
+        touched = {}
+        incoming = predecessors[k]
+        for target in list(blocks[splitter]):
+            for source in incoming[target]:
+                touched.setdefault(block_of[source], []).append(source)
         
-        for partition in partitions:
-            # Intentar dividir la partición actual
-            subpartitions = split_partition(dfa, partition, partitions)
+        for b, members in touched.items():
+            block = blocks[b]
+            if len(members) == len(block):
+                continue
             
-            if len(subpartitions) > 1:
-                changed = True
-                new_partitions.extend(subpartitions)
+            # Dividir el bloque; la mitad más pequeña recibe un nuevo índice
+            if 2 * len(members) <= len(block):
+                small = set(members)
+                block -= small
             else:
-                new_partitions.append(partition)
-        
-        partitions = new_partitions
+                small = block - set(members)
+                blocks[b] = set(members)
+            
+            new_block = len(blocks)
+            blocks.append(small)
+            for state in small:
+                block_of[state] = new_block
+            
+            for symbol_index in range(len(symbols)):
+                worklist.append((new_block, symbol_index))
     
-    # Construir el AFD minimizado
-    return build_minimized_dfa(dfa, partitions)
-
-def split_partition(dfa, partition, partitions):
-    """Divide una partición en subparticiones basadas en transiciones"""
-    if len(partition) <= 1:
-        return [partition]
-    
-    subpartitions = {}
-    
-    # Para cada estado en la partición
-    for state_id in partition:
-        # Calcular la firma de transición del estado
-        signature = []
-        for symbol in sorted(dfa.alphabet):
-            target = dfa.get_transition(state_id, symbol)
-            # Determinar a qué partición pertenece el estado destino
-            target_partition = -1
-            if target is not None:
-                for i, p in enumerate(partitions):
-                    if target in p:
-                        target_partition = i
-                        break
-            signature.append((symbol, target_partition))
-        
-        # Usar la firma como clave para agrupar estados
-        signature_tuple = tuple(signature)
-        if signature_tuple not in subpartitions:
-            subpartitions[signature_tuple] = set()
-        subpartitions[signature_tuple].add(state_id)
-    
-    # Convertir los conjuntos a frozensets para hacerlos inmutables
-    return [frozenset(states) for states in subpartitions.values()]
+    # Descartar el estado muerto implícito y ordenar los bloques según el orden original
+    partitions = []
+    for block in blocks:
+        block.discard(dead)
+        if block:
+            partitions.append(sorted(block))
+    partitions.sort()
+    
+    return [frozenset(state_ids[i] for i in block) for block in partitions]
 
 def build_minimized_dfa(original_dfa, partitions):
     """Construye un nuevo AFD basado en las particiones"""
     minimized_dfa = DFA()
+    minimized_dfa.symbol_classes = original_dfa.symbol_classes
     
     # Mapeo de estados originales a estados minimizados
     state_mapping = {}
@@ -88,6 +124,11 @@ def build_minimized_dfa(original_dfa, partitions):
         # Crear un nuevo estado en el AFD minimizado
         new_state = minimized_dfa.create_state(is_final=is_final)
         
+        # Conservar los patrones que acepta la partición (todos sus estados comparten etiquetas)
+        tags = original_dfa.state_tags.get(next(iter(partition)))
+        if tags:
+            minimized_dfa.state_tags[new_state.state_id] = tags
+        
         # Mapear cada estado original en esta partición al nuevo estado
         for state_id in partition:
             state_mapping[state_id] = new_state.state_id
@@ -0,0 +1,188 @@
+"""
+Autómata de posiciones de Glushkov y su simulación con paralelismo de bits.
+
+El autómata de Glushkov no tiene transiciones epsilon: tiene un estado por cada aparición de
+un símbolo en la expresión (una "posición") más el estado inicial 0, y todas las
+transiciones que entran a la posición p llevan el símbolo de p. Por eso un conjunto de
+estados activos se representa con un único entero (bit p = posición p activa) y un paso de
+la simulación es:
+    
+    D' = (((D << 1) & lineales) | saltos(D)) & B[c]
+
+donde B[c] es la máscara de las posiciones cuyo símbolo acepta el carácter c, 'lineales'
+marca las posiciones p + 1 que siguen directamente a p (las concatenaciones, que se
+resuelven con un desplazamiento como en Shift-And) y saltos(D) une los conjuntos siguientes
+restantes mediante tablas precalculadas por bloques de 8 bits de D.
+"""
+from .bitset import iter_bits
+from .charclass import CharClass, is_class_token
+from .regex_ast import Concat, Repeat, Symbol, Epsilon, fold, parse_postfix, simplify
+
+class GlushkovAutomaton:
+    """Autómata de posiciones (sin transiciones epsilon) de una expresión regular"""
+    __slots__ = ('symbols', 'follow', 'final_mask')
+    
+    def __init__(self, symbols, follow, final_mask):
+        self.symbols = symbols        # posición -> token del símbolo (None para el estado inicial 0)
+        self.follow = follow          # posición -> bitset de posiciones siguientes
+        self.final_mask = final_mask  # bitset de las posiciones finales (bit 0 si acepta ε)
+    
+    @classmethod
+    def from_postfix(cls, postfix):
+        """Construye el autómata a partir de una expresión en notación postfix"""
+        return cls.from_ast(simplify(parse_postfix(postfix)))
+    
+    @classmethod
+    def from_ast(cls, node):
+        """Construye el autómata a partir del AST de la expresión"""
+        symbols = [None]
+        follow = [0]
+        
+        def add_follow(sources, targets):
+            if targets:
+                for position in iter_bits(sources):
+                    follow[position] |= targets
+        
+        def visit(node, items):
+            """
+            Retorna (acepta ε, bitset de primeras posiciones, bitset de últimas posiciones) a
+            partir de los valores de los hijos; fold visita las hojas de izquierda a derecha,
+            por lo que las posiciones se numeran en el orden de la expresión.
+            """
+            if isinstance(node, Epsilon):
+                return True, 0, 0
+            
+            if isinstance(node, Symbol):
+                bit = 1 << len(symbols)
+                symbols.append(node.token)
+                follow.append(0)
+                return False, bit, bit
+            
+            if isinstance(node, Repeat):
+                nullable, first, last = items[0]
+                if node.op != '?':
+                    add_follow(last, first)
+                return nullable or node.op != '+', first, last
+            
+            if isinstance(node, Concat):
+                nullable, first, last = True, 0, 0
+                for item_nullable, item_first, item_last in items:
+                    add_follow(last, item_first)
+                    if nullable:
+                        first |= item_first
+                    last = item_last | (last if item_nullable else 0)
+                    nullable = nullable and item_nullable
+                return nullable, first, last
+            
+            nullable, first, last = False, 0, 0
+            for item_nullable, item_first, item_last in items:
+                nullable = nullable or item_nullable
+                first |= item_first
+                last |= item_last
+            return nullable, first, last
+        
+        nullable, first, last = fold(node, visit)
+        follow[0] = first
+        
+        return cls(symbols, follow, last | (1 if nullable else 0))
+    
+    @property
+    def num_positions(self):
+        """Número de posiciones (símbolos de la expresión), sin contar el estado inicial"""
+        return len(self.symbols) - 1
+    
+    def matcher(self):
+        """Retorna el simulador con paralelismo de bits de este autómata"""
+        return BitParallelMatcher(self)
+
+class BitParallelMatcher:
+    """Simulador del autómata de Glushkov con los estados activos en un solo entero"""
+    __slots__ = ('automaton', 'linear_mask', 'jump_mask', 'jump_tables', 'final_mask',
+                 '_char_masks', '_other_mask')
+    
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.final_mask = automaton.final_mask
+        follow = automaton.follow
+        size = len(follow)
+        
+        # Separar las transiciones p -> p + 1 (se resuelven con un desplazamiento) del resto
+        self.linear_mask = 0
+        jumps = list(follow)
+        for position in range(size - 1):
+            if follow[position] >> (position + 1) & 1:
+                self.linear_mask |= 1 << (position + 1)
+                jumps[position] &= ~(1 << (position + 1))
+        
+        self.jump_mask = 0
+        for position, targets in enumerate(jumps):
+            if targets:
+                self.jump_mask |= 1 << position
+        
+        # Tablas por bloque de 8 posiciones: tabla[k][v] = unión de los siguientes de los bits
+        # de v; los bloques sin saltos no se consultan nunca y no tienen tabla
+        self.jump_tables = []
+        for block in range(0, size, 8):
+            if not (self.jump_mask >> block) & 255:
+                self.jump_tables.append(None)
+                continue
+            table = [0] * 256
+            for value in range(1, 256):
+                low = value & -value
+                position = block + low.bit_length() - 1
+                table[value] = table[value ^ low] | (jumps[position] if position < size else 0)
+            self.jump_tables.append(table)
+        
+        # Máscaras B[c]: solo los caracteres que aparecen en la expresión (como literal o
+        # dentro de una clase) tienen máscara propia; todos los demás se comportan igual y
+        # comparten la máscara de las clases negadas
+        literal_masks = {}
+        class_masks = []
+        for position, token in enumerate(automaton.symbols):
+            if token is None:
+                continue
+            if is_class_token(token):
+                class_masks.append((CharClass.parse(token), 1 << position))
+            else:
+                literal_masks[token] = literal_masks.get(token, 0) | (1 << position)
+        
+        explicit = set(literal_masks)
+        self._other_mask = 0
+        for char_class, bit in class_masks:
+            explicit |= char_class.chars
+            if char_class.negated:
+                self._other_mask |= bit
+        
+        self._char_masks = {}
+        for char in explicit:
+            mask = literal_masks.get(char, 0)
+            for char_class, bit in class_masks:
+                if char in char_class:
+                    mask |= bit
+            self._char_masks[char] = mask
+    
+    def match(self, input_string):
+        """Verifica si la cadena completa pertenece al lenguaje"""
+        linear_mask = self.linear_mask
+        jump_mask = self.jump_mask
+        jump_tables = self.jump_tables
+        get_mask = self._char_masks.get
+        other_mask = self._other_mask
+        active = 1
+        
+        for char in input_string:
+            reach = (active << 1) & linear_mask
+            
+            # Unir los siguientes de las posiciones activas con saltos, un bloque de 8 bits
+            # no vacío a la vez
+            jumping = active & jump_mask
+            while jumping:
+                shift = ((jumping & -jumping).bit_length() - 1) & ~7
+                reach |= jump_tables[shift >> 3][(jumping >> shift) & 255]
+                jumping &= ~(255 << shift)
+            
+            active = reach & get_mask(char, other_mask)
+            if not active:
+                return False
+        
+        return bool(active & self.final_mask)
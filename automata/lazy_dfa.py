@@ -0,0 +1,126 @@
+from .bitset import iter_bits, mask_from_states
+
+class LazyState:
+    """Estado del AFD perezoso: un conjunto de estados del AFN (bitset) y sus transiciones ya calculadas"""
+    __slots__ = ('mask', 'is_final', 'transitions')
+    
+    def __init__(self, mask, is_final):
+        self.mask = mask
+        self.is_final = is_final
+        self.transitions = {}  # etiqueta de clase -> LazyState
+
+class LazyDFA:
+    """
+    AFD perezoso (construido sobre la marcha) a partir de un AFN.
+    
+    Los estados del AFD solo se crean cuando la entrada los alcanza y se guardan en una
+    caché acotada; cuando la caché se llena se vacía por completo y se sigue construyendo.
+    Cada carácter cuesta una búsqueda en un diccionario si la transición ya está en caché,
+    o un paso de simulación del AFN si no, por lo que la simulación es siempre lineal en
+    el largo de la entrada y nunca se pagan estados que ninguna entrada visita.
+    
+    Las transiciones se indexan por la clase de equivalencia del carácter (o por el símbolo
+    del alfabeto si no hay clases), con una sola clase para todos los caracteres que no
+    aparecen en la expresión: cada estado guarda a lo más una transición por clase aunque la
+    entrada tenga muchos caracteres Unicode distintos.
+    """
+    def __init__(self, nfa, max_states=10000):
+        if max_states < 2:
+            raise ValueError("La caché del AFD perezoso necesita al menos 2 estados")
+        self.max_states = max_states
+        self.alphabet = set(nfa.alphabet)
+        self.symbol_classes = nfa.symbol_classes
+        
+        # Traducción carácter -> etiqueta usada como clave de las transiciones
+        if self.symbol_classes is None:
+            self._labels = {symbol: symbol for symbol in self.alphabet}
+            self._default_label = None
+        else:
+            self._labels = self.symbol_classes.labels
+            self._default_label = self.symbol_classes.default
+        
+        # Cerraduras epsilon y movimientos precalculados del AFN
+        closures = nfa.epsilon_closure_masks()
+        self._moves = nfa.move_masks(closures)
+        self._moving_mask = mask_from_states(
+            state_id for state_id, state_moves in enumerate(self._moves) if state_moves)
+        self._final_mask = mask_from_states(nfa.final_states)
+        start_mask = closures[nfa.start_state] if nfa.start_state is not None else 0
+        
+        self._states = {}
+        self._dead = LazyState(0, False)
+        self._start = self._get_state(start_mask)
+        
+        # Estadísticas de la caché
+        self.steps = 0
+        self.misses = 0
+        self.flushes = 0
+    
+    def _get_state(self, mask):
+        """Obtiene (o crea) el estado correspondiente a un bitset"""
+        if not mask:
+            return self._dead
+        state = self._states.get(mask)
+        if state is None:
+            state = LazyState(mask, bool(mask & self._final_mask))
+            self._states[mask] = state
+        return state
+    
+    def _flush(self, current):
+        """Vacía la caché conservando solo el estado inicial y el estado actual"""
+        self.flushes += 1
+        self._states = {}
+        for state in (self._start, current):
+            state.transitions = {}
+            self._states[state.mask] = state
+    
+    def _compute_transition(self, state, label):
+        """Calcula una transición que no está en caché mediante un paso del AFN"""
+        self.misses += 1
+        if len(self._states) >= self.max_states:
+            self._flush(state)
+        
+        next_mask = 0
+        for state_id in iter_bits(state.mask & self._moving_mask):
+            for move_symbol, mask in self._moves[state_id]:
+                if move_symbol == label:
+                    next_mask |= mask
+        
+        next_state = self._get_state(next_mask)
+        state.transitions[label] = next_state
+        return next_state
+    
+    def match(self, input_string):
+        """Verifica si la cadena completa pertenece al lenguaje"""
+        dead = self._dead
+        state = self._start
+        get_label = self._labels.get
+        default_label = self._default_label
+        steps = 0
+        
+        for symbol in input_string:
+            steps += 1
+            label = get_label(symbol, default_label)
+            next_state = state.transitions.get(label)
+            if next_state is None:
+                next_state = self._compute_transition(state, label)
+            if next_state is dead:
+                self.steps += steps
+                return False
+            state = next_state
+        
+        self.steps += steps
+        return state.is_final
+    
+    def stats(self):
+        """Retorna las estadísticas de uso de la caché de estados"""
+        hits = self.steps - self.misses
+        return {
+            'states': len(self._states),
+            'max_states': self.max_states,
+            'steps': self.steps,
+            'hits': hits,
+            'misses': self.misses,
+            'hit_rate': hits / self.steps if self.steps else 0.0,
+            'flushes': self.flushes,
+        }
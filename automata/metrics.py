@@ -0,0 +1,105 @@
+"""
+Instrumentación del proceso de compilación.
+
+CompileMetrics acumula, para una expresión, el tiempo de cada etapa, el tamaño de los
+autómatas generados y el motivo de falla si lo hubo. Medir una etapa solo cuesta dos
+llamadas a time.perf_counter, y cuando no hay métricas activas measure() retorna un
+contexto vacío, por lo que la instrumentación se puede dejar encendida en producción.
+"""
+from contextlib import contextmanager, nullcontext
+import json
+import threading
+import time
+
+def count_transitions(automaton):
+    """Cuenta las transiciones de un AFN o AFD"""
+    total = 0
+    for state in automaton.states.values():
+        for targets in state.transitions.values():
+            total += len(targets) if isinstance(targets, list) else 1
+    return total
+
+class CompileMetrics:
+    """Métricas de la compilación y simulación de una expresión regular"""
+    def __init__(self, regex, index=None):
+        self.regex = regex
+        self.index = index
+        self.timestamp = time.time()
+        self.stage_times = {}  # etapa -> segundos
+        self.counts = {}       # p. ej. 'nfa_states', 'dfa_transitions', 'alphabet_size'
+        self.cache_hit = None
+        self.result = None
+        self.failure = None
+        self.engine = None     # motor usado: 'dfa', 'glushkov' o 'lazy_dfa'
+        self.fallback = None   # motivo por el que no se usó el AFD, si lo hubo
+    
+    @contextmanager
+    def stage(self, name):
+        """Mide el tiempo de una etapa; si se repite, los tiempos se suman"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + time.perf_counter() - start
+    
+    def record_automaton(self, prefix, automaton):
+        """Registra el número de estados y transiciones de un autómata"""
+        self.counts[f"{prefix}_states"] = len(automaton.states)
+        self.counts[f"{prefix}_transitions"] = count_transitions(automaton)
+    
+    @property
+    def total_time(self):
+        """Tiempo total de todas las etapas medidas"""
+        return sum(self.stage_times.values())
+    
+    def to_dict(self):
+        """Retorna las métricas como un diccionario serializable a JSON"""
+        return {
+            'timestamp': self.timestamp,
+            'index': self.index,
+            'regex': self.regex,
+            'stage_times': self.stage_times,
+            'total_time': self.total_time,
+            'counts': self.counts,
+            'cache_hit': self.cache_hit,
+            'result': self.result,
+            'failure': self.failure,
+            'engine': self.engine,
+            'fallback': self.fallback,
+        }
+
+def measure(metrics, name):
+    """Retorna el contexto que mide una etapa, o un contexto vacío si no hay métricas"""
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+class JSONLinesExporter:
+    """
+    Callback de métricas que agrega cada registro como una línea JSON a un archivo.
+    Se puede enviar a procesos trabajadores: cada proceso abre su propio descriptor
+    en modo de anexado.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, metrics):
+        line = json.dumps(metrics.to_dict(), ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self):
+        """Cierra el archivo de salida"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def __getstate__(self):
+        return {'path': self.path}
+    
+    def __setstate__(self, state):
+        self.__init__(state['path'])
@@ -0,0 +1,79 @@
+from .compiled_dfa import CompiledDFA
+
+class MultiPatternMatcher:
+    """
+    Verificador de varios patrones a la vez sobre un único AFD cuyos estados finales
+    están etiquetados con los ids de los patrones que aceptan. Una sola pasada por la
+    cadena determina todos los patrones que la aceptan. Cuando varios patrones coinciden,
+    tiene prioridad el de menor id (el que aparece primero en la lista).
+    """
+    def __init__(self, dfa, patterns=()):
+        self.dfa = dfa
+        self.patterns = tuple(patterns)
+        self.compiled = CompiledDFA.from_dfa(dfa)
+        
+        # Etiquetas por índice de estado compilado (la última posición es el estado muerto)
+        empty = frozenset()
+        self.tags = tuple(dfa.state_tags.get(state_id, empty) for state_id in self.compiled.state_ids) + (empty,)
+        self.winners = tuple(min(tags) if tags else None for tags in self.tags)
+    
+    def _final_state(self, input_string):
+        """Recorre la cadena completa y retorna el índice del estado alcanzado"""
+        compiled = self.compiled
+        table = compiled.table
+        get_column = compiled.symbol_map.get
+        default_column = compiled.default_column
+        dead = compiled.dead
+        state = compiled.start
+        
+        for symbol in input_string:
+            state = table[state + get_column(symbol, default_column)]
+            if state == dead:
+                break
+        
+        return state // compiled.width
+    
+    def match(self, input_string):
+        """Retorna el conjunto de ids de los patrones que aceptan la cadena completa"""
+        return self.tags[self._final_state(input_string)]
+    
+    def classify(self, input_string):
+        """Retorna el id del patrón de mayor prioridad que acepta la cadena, o None"""
+        return self.winners[self._final_state(input_string)]
+    
+    def tokenize(self, text):
+        """
+        Divide un texto en tokens (id del patrón, lexema) con la regla del lexema más largo;
+        los empates se resuelven por prioridad. Lanza ValueError si ningún patrón reconoce
+        un lexema no vacío en alguna posición.
+        """
+        compiled = self.compiled
+        table = compiled.table
+        get_column = compiled.symbol_map.get
+        default_column = compiled.default_column
+        dead = compiled.dead
+        width = compiled.width
+        winners = self.winners
+        n = len(text)
+        
+        position = 0
+        while position < n:
+            state = compiled.start
+            last_end = -1
+            last_winner = None
+            i = position
+            while i < n:
+                state = table[state + get_column(text[i], default_column)]
+                if state == dead:
+                    break
+                i += 1
+                winner = winners[state // width]
+                if winner is not None:
+                    last_end = i
+                    last_winner = winner
+            
+            if last_end < 0:
+                raise ValueError(f"Ningún patrón reconoce el texto en la posición {position}")
+            
+            yield last_winner, text[position:last_end]
+            position = last_end
@@ -1,4 +1,6 @@
 from .state import NFAState
+from .bitset import closure_masks
+from .compact_nfa import CompactNFA
 
 class NFA:
     """Clase para representar un Autómata Finito No Determinista"""
@@ -8,6 +10,8 @@ class NFA:
         self.final_states = set()
         self.alphabet = set()
         self.state_counter = 0
+        self.accept_tags = {}  # Estado de aceptación -> id del patrón (compilación de varios patrones)
+        self.symbol_classes = None  # Traducción carácter -> clase de equivalencia (ver charclass)
     
     def create_state(self, is_final=False):
         """Crea un nuevo estado"""
@@ -44,6 +48,10 @@ class NFA:
         """Añade una transición epsilon al AFN"""
         self.add_transition(from_state, 'ε', to_state)
     
+    def compact(self):
+        """Retorna una copia del AFN en representación compacta basada en arreglos"""
+        return CompactNFA.from_nfa(self)
+    
     def epsilon_closure(self, states):
         """Calcula la cerradura epsilon de un conjunto de estados"""
         closure = set(states)
@@ -59,6 +67,34 @@ class NFA:
         
         return closure
     
+    def epsilon_closure_masks(self):
+        """
+        Calcula la cerradura epsilon de cada estado como bitset, una sola vez por estado
+        (ver bitset.closure_masks). Retorna una lista indexada por id de estado.
+        """
+        size = self.state_counter
+        epsilon_edges = [[] for _ in range(size)]
+        for state_id, state in self.states.items():
+            epsilon_edges[state_id] = state.transitions.get('ε', [])
+        
+        return closure_masks(epsilon_edges)
+    
+    def move_masks(self, closures):
+        """
+        Precalcula, para cada estado, la lista de pares (símbolo, bitset) con la cerradura
+        epsilon de los estados alcanzables con ese símbolo. Retorna una lista indexada por id.
+        """
+        moves = [[] for _ in range(self.state_counter)]
+        for state_id, state in self.states.items():
+            for symbol, targets in state.transitions.items():
+                if symbol == 'ε':
+                    continue
+                mask = 0
+                for target in targets:
+                    mask |= closures[target]
+                moves[state_id].append((symbol, mask))
+        return moves
+    
     def move(self, states, symbol):
         """Calcula el conjunto de estados alcanzables desde un conjunto de estados con un símbolo"""
         result = set()
@@ -74,8 +110,12 @@ class NFA:
             return False
         
         current_states = self.epsilon_closure({self.start_state})
+        classes = self.symbol_classes
         
         for symbol in input_string:
+            if classes is not None:
+                symbol = classes.label_of(symbol)
+            
             next_states = set()
             for state_id in current_states:
                 if state_id in self.states:
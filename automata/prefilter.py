@@ -0,0 +1,165 @@
+"""
+Prefiltro de literales: condiciones necesarias que se verifican antes de recorrer el AFD.
+
+A partir del AST de la expresión se calcula el largo mínimo y máximo de las cadenas del
+lenguaje, el prefijo y el sufijo literales comunes a todas ellas y las subcadenas literales
+que toda cadena aceptada contiene (como 'abb' en '(a|b)*abb'). Estas verificaciones usan
+len, str.startswith, str.endswith y el operador 'in', que se ejecutan en C, por lo que la
+mayoría de las cadenas rechazadas no llegan a recorrer el autómata.
+
+Todas las condiciones son necesarias pero no suficientes: si check() retorna True la
+cadena todavía debe verificarse con el autómata.
+"""
+from .charclass import is_class_token
+from .regex_ast import Concat, Repeat, Symbol, Epsilon, fold, parse_postfix, simplify
+
+# Máximo de subcadenas obligatorias que se guardan por nodo (las más largas)
+MAX_REQUIRED = 4
+
+class _Literals:
+    """Información literal de un nodo del AST"""
+    __slots__ = ('exact', 'prefix', 'suffix', 'required', 'min_length', 'max_length')
+    
+    def __init__(self, exact, prefix, suffix, required, min_length, max_length):
+        self.exact = exact              # única cadena del lenguaje, o None si hay varias
+        self.prefix = prefix            # prefijo común a todas las cadenas
+        self.suffix = suffix            # sufijo común a todas las cadenas
+        self.required = required        # subcadenas contenidas en todas las cadenas
+        self.min_length = min_length
+        self.max_length = max_length    # None si no está acotado
+
+def _maximal(literals):
+    """Descarta las subcadenas vacías o contenidas en otra y conserva las MAX_REQUIRED más largas"""
+    result = []
+    for literal in sorted(set(literals), key=len, reverse=True):
+        if literal and not any(literal in other for other in result):
+            result.append(literal)
+    return tuple(result[:MAX_REQUIRED])
+
+def _common_prefix(strings):
+    """Prefijo común más largo de varias cadenas"""
+    first = min(strings)
+    last = max(strings)
+    length = 0
+    while length < len(first) and first[length] == last[length]:
+        length += 1
+    return first[:length]
+
+def _common_suffix(strings):
+    """Sufijo común más largo de varias cadenas"""
+    return _common_prefix([string[::-1] for string in strings])[::-1]
+
+def _analyze(node, items):
+    """Calcula la información literal de un nodo a partir de la de sus hijos (ver fold)"""
+    if isinstance(node, Epsilon):
+        return _Literals('', '', '', (), 0, 0)
+    
+    if isinstance(node, Symbol):
+        if is_class_token(node.token):
+            return _Literals(None, '', '', (), 1, 1)
+        return _Literals(node.token, node.token, node.token, (node.token,), 1, 1)
+    
+    if isinstance(node, Repeat):
+        inner = items[0]
+        if inner.max_length == 0:
+            return inner
+        if node.op == '+':
+            # Toda cadena contiene al menos una repetición completa
+            return _Literals(None, inner.prefix, inner.suffix, inner.required, inner.min_length, None)
+        return _Literals(None, '', '', (), 0, inner.max_length if node.op == '?' else None)
+    
+    if isinstance(node, Concat):
+        min_length = sum(item.min_length for item in items)
+        max_length = None
+        if all(item.max_length is not None for item in items):
+            max_length = sum(item.max_length for item in items)
+        
+        if all(item.exact is not None for item in items):
+            exact = ''.join(item.exact for item in items)
+            return _Literals(exact, exact, exact, (exact,), min_length, max_length)
+        
+        # El prefijo se extiende con los nodos exactos hasta el primero que no lo es
+        prefix = ''
+        for item in items:
+            prefix += item.prefix
+            if item.exact is None:
+                break
+        suffix = ''
+        for item in reversed(items):
+            suffix = item.suffix + suffix
+            if item.exact is None:
+                break
+        
+        # Entre dos nodos no exactos, el sufijo del primero, los nodos exactos intermedios y el
+        # prefijo del segundo forman una subcadena contigua obligatoria
+        required = []
+        run = ''
+        for item in items:
+            if item.exact is not None:
+                run += item.exact
+                continue
+            required.append(run + item.prefix)
+            required.extend(item.required)
+            run = item.suffix
+        required.append(run)
+        
+        return _Literals(None, prefix, suffix, _maximal(required), min_length, max_length)
+    
+    # Unión: solo lo que comparten todas las alternativas
+    min_length = min(item.min_length for item in items)
+    max_length = None
+    if all(item.max_length is not None for item in items):
+        max_length = max(item.max_length for item in items)
+    prefix = _common_prefix([item.prefix for item in items])
+    suffix = _common_suffix([item.suffix for item in items])
+    required = [literal for literal in items[0].required
+                if all(any(literal in other for other in item.required) for item in items[1:])]
+    
+    return _Literals(None, prefix, suffix, _maximal(required + [prefix, suffix]), min_length, max_length)
+
+class Prefilter:
+    """Condiciones necesarias (largo, prefijo, sufijo y subcadenas) de las cadenas de un lenguaje"""
+    __slots__ = ('min_length', 'max_length', 'prefix', 'suffix', 'required')
+    
+    def __init__(self, min_length=0, max_length=None, prefix='', suffix='', required=()):
+        self.min_length = min_length
+        self.max_length = max_length    # None si no está acotado
+        self.prefix = prefix
+        self.suffix = suffix
+        self.required = required        # subcadenas que no están dentro del prefijo ni del sufijo
+    
+    @classmethod
+    def from_postfix(cls, postfix):
+        """Construye el prefiltro de una expresión en notación postfix"""
+        return cls.from_ast(simplify(parse_postfix(postfix)))
+    
+    @classmethod
+    def from_ast(cls, node):
+        """Construye el prefiltro a partir del AST de la expresión"""
+        info = fold(node, _analyze)
+        required = tuple(literal for literal in info.required
+                         if literal not in info.prefix and literal not in info.suffix)
+        return cls(info.min_length, info.max_length, info.prefix, info.suffix, required)
+    
+    def is_trivial(self):
+        """Indica si el prefiltro acepta cualquier cadena (no vale la pena verificarlo)"""
+        return (self.min_length == 0 and self.max_length is None and not self.prefix
+                and not self.suffix and not self.required)
+    
+    def check(self, text):
+        """Retorna False si la cadena no puede pertenecer al lenguaje"""
+        length = len(text)
+        if length < self.min_length:
+            return False
+        if self.max_length is not None and length > self.max_length:
+            return False
+        if not text.startswith(self.prefix) or not text.endswith(self.suffix):
+            return False
+        for literal in self.required:
+            if literal not in text:
+                return False
+        return True
+    
+    def __repr__(self):
+        return (f"Prefilter(min_length={self.min_length}, max_length={self.max_length}, "
+                f"prefix={self.prefix!r}, suffix={self.suffix!r}, required={self.required!r})")
@@ -0,0 +1,389 @@
+"""
+Árbol de sintaxis abstracta (AST) de una expresión regular y simplificación por reescritura.
+
+La expresión en notación postfix se convierte en un AST, se simplifica aplicando reglas que
+conservan el lenguaje y se vuelve a escribir en postfix antes de la construcción de Thompson,
+de modo que la estructura redundante no llega al AFN:
+    
+    (a*)*, a**, (a+)?      ->  a*          (repeticiones anidadas)
+    (ε|a)*, (a*|b)*        ->  a*, (a|b)*  (ε y repeticiones dentro de una cerradura)
+    a|a                    ->  a           (alternativas repetidas)
+    abc|abd, ac|bc         ->  ab(c|d), (a|b)c   (prefijos y sufijos comunes)
+    aεb, a|ε               ->  ab, a?      (ε redundante)
+
+Todos los recorridos del AST (simplificación, escritura en postfix, hash, igualdad y las
+pasadas de otros módulos basadas en fold) usan una pila explícita en lugar de recursión, de
+modo que las expresiones generadas automáticamente con miles de niveles de anidamiento no
+superan el límite de recursión de Python.
+"""
+from .charclass import split_tokens
+
+class Node:
+    """Nodo base del AST; los nodos son inmutables y se comparan por estructura"""
+    __slots__ = ('_hash', '_nullable')
+    
+    def _key(self):
+        raise NotImplementedError
+    
+    def __eq__(self, other):
+        # Comparación estructural con una pila de pares en lugar de comparar las tuplas de
+        # hijos (que compararía recursivamente)
+        pairs = [(self, other)]
+        while pairs:
+            left, right = pairs.pop()
+            if left is right:
+                continue
+            if type(left) is not type(right) or hash(left) != hash(right):
+                return False
+            if isinstance(left, Symbol):
+                if left.token != right.token:
+                    return False
+            elif isinstance(left, Repeat):
+                if left.op != right.op:
+                    return False
+                pairs.append((left.node, right.node))
+            elif isinstance(left, (Concat, Alt)):
+                if len(left.items) != len(right.items):
+                    return False
+                pairs.extend(zip(left.items, right.items))
+        return True
+    
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            return _fill(self, '_hash', lambda node: hash((type(node).__name__, node._key())))
+
+class Epsilon(Node):
+    """La cadena vacía (ε)"""
+    __slots__ = ()
+    
+    def _key(self):
+        return ()
+    
+    def __repr__(self):
+        return "Epsilon()"
+
+class Symbol(Node):
+    """Un símbolo: un carácter o una clase de caracteres entre corchetes"""
+    __slots__ = ('token',)
+    
+    def __init__(self, token):
+        self.token = token
+    
+    def _key(self):
+        return self.token
+    
+    def __repr__(self):
+        return f"Symbol({self.token!r})"
+
+class Concat(Node):
+    """Concatenación de dos o más nodos"""
+    __slots__ = ('items',)
+    
+    def __init__(self, items):
+        self.items = items
+    
+    def _key(self):
+        return tuple(self.items)
+    
+    def __repr__(self):
+        return f"Concat({list(self.items)!r})"
+
+class Alt(Node):
+    """Unión de dos o más alternativas"""
+    __slots__ = ('items',)
+    
+    def __init__(self, items):
+        self.items = items
+    
+    def _key(self):
+        return tuple(self.items)
+    
+    def __repr__(self):
+        return f"Alt({list(self.items)!r})"
+
+class Repeat(Node):
+    """Repetición de un nodo: '*' (cero o más), '+' (una o más) o '?' (cero o una)"""
+    __slots__ = ('node', 'op')
+    
+    def __init__(self, node, op):
+        self.node = node
+        self.op = op
+    
+    def _key(self):
+        return (self.op, self.node)
+    
+    def __repr__(self):
+        return f"Repeat({self.node!r}, {self.op!r})"
+
+EPSILON = Epsilon()
+
+def children(node):
+    """Retorna los hijos directos de un nodo"""
+    if isinstance(node, Repeat):
+        return (node.node,)
+    if isinstance(node, (Concat, Alt)):
+        return node.items
+    return ()
+
+def _fill(node, slot, compute):
+    """
+    Calcula el atributo 'slot' de un nodo y de los descendientes que aún no lo tienen, en
+    post-orden y sin recursión; compute(nodo) puede usar el atributo ya calculado de los hijos.
+    """
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        pending = [child for child in children(current) if not hasattr(child, slot)]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if not hasattr(current, slot):
+            setattr(current, slot, compute(current))
+    return getattr(node, slot)
+
+def fold(node, combine):
+    """
+    Recorre el AST en post-orden sin recursión y retorna combine(nodo, resultados de los
+    hijos) para la raíz. Los hijos se visitan de izquierda a derecha, por lo que las hojas
+    se combinan en el orden en que aparecen en la expresión.
+    """
+    results = []
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        items = children(current)
+        if expanded or not items:
+            values = results[len(results) - len(items):]
+            del results[len(results) - len(items):]
+            results.append(combine(current, values))
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(items))
+    return results[0]
+
+def parse_postfix(postfix):
+    """
+    Construye el AST de una expresión en notación postfix. Las concatenaciones y uniones
+    encadenadas se aplanan durante el análisis, por lo que la profundidad del árbol solo
+    depende del anidamiento de la expresión y no de su largo.
+    """
+    stack = []
+    
+    for token in split_tokens(postfix):
+        if token in ('.', '|'):
+            if len(stack) < 2:
+                if token == '.':
+                    raise ValueError("Expresión inválida para concatenación")
+                raise ValueError("Expresión inválida para unión")
+            
+            right = stack.pop()
+            left = stack.pop()
+            node_type = Concat if token == '.' else Alt
+            
+            # Los nodos de la pila aún no se comparten, así que se pueden extender en su lugar
+            if type(left) is node_type:
+                node = left
+            else:
+                node = node_type([left])
+            if type(right) is node_type:
+                node.items.extend(right.items)
+            else:
+                node.items.append(right)
+            stack.append(node)
+        
+        elif token in ('*', '+', '?'):
+            if not stack:
+                if token == '*':
+                    raise ValueError("Expresión inválida para cerradura de Kleene")
+                if token == '+':
+                    raise ValueError("Expresión inválida para una o más ocurrencias")
+                raise ValueError("Expresión inválida para cero o una ocurrencia")
+            stack.append(Repeat(stack.pop(), token))
+        
+        elif token == 'ε':
+            stack.append(EPSILON)
+        
+        else:
+            stack.append(Symbol(token))
+    
+    if len(stack) != 1:
+        raise ValueError("Expresión regular inválida")
+    
+    return stack[0]
+
+def _nullable(node):
+    """Calcula si un nodo acepta la cadena vacía a partir del valor ya calculado de sus hijos"""
+    if isinstance(node, Epsilon):
+        return True
+    if isinstance(node, Symbol):
+        return False
+    if isinstance(node, Repeat):
+        return node.op != '+' or node.node._nullable
+    if isinstance(node, Concat):
+        return all(item._nullable for item in node.items)
+    return any(item._nullable for item in node.items)
+
+def nullable(node):
+    """Indica si el lenguaje del nodo contiene la cadena vacía (el resultado se guarda en el nodo)"""
+    try:
+        return node._nullable
+    except AttributeError:
+        return _fill(node, '_nullable', _nullable)
+
+def make_repeat(node, op):
+    """Construye la repetición 'op' de un nodo ya simplificado"""
+    if isinstance(node, Epsilon):
+        return EPSILON
+    
+    # Un nodo que acepta ε: x+ equivale a x* y x? equivale a x
+    if nullable(node):
+        if op == '?':
+            return node
+        op = '*'
+    
+    # Repeticiones anidadas: la misma operación es idempotente y cualquier mezcla es '*'
+    if isinstance(node, Repeat):
+        if node.op == op:
+            return node
+        return make_repeat(node.node, '*')
+    
+    # Dentro de una cerradura, las repeticiones de cada alternativa sobran: (x*|y)* = (x|y)*
+    if op == '*' and isinstance(node, Alt) and any(isinstance(item, Repeat) for item in node.items):
+        inner = make_alt([item.node if isinstance(item, Repeat) else item for item in node.items])
+        return make_repeat(inner, '*')
+    
+    return Repeat(node, op)
+
+def make_concat(items):
+    """Construye la concatenación de nodos ya simplificados"""
+    result = []
+    for item in items:
+        parts = item.items if isinstance(item, Concat) else (item,)
+        for part in parts:
+            if isinstance(part, Epsilon):
+                continue
+            # x*x* = x*
+            if result and isinstance(part, Repeat) and part.op == '*' and result[-1] == part:
+                continue
+            result.append(part)
+    
+    if not result:
+        return EPSILON
+    if len(result) == 1:
+        return result[0]
+    return Concat(tuple(result))
+
+def _sequence(node):
+    """Retorna un nodo como secuencia de factores concatenados"""
+    return node.items if isinstance(node, Concat) else (node,)
+
+def _factor(alternatives, suffix):
+    """
+    Agrupa las alternativas que comparten el primer (o el último) factor y extrae el prefijo
+    (o sufijo) común más largo de cada grupo. El orden de los grupos es el de su primera aparición.
+    """
+    groups = {}
+    for alternative in alternatives:
+        sequence = _sequence(alternative)
+        groups.setdefault(sequence[-1] if suffix else sequence[0], []).append(sequence)
+    
+    if len(groups) == len(alternatives):
+        return alternatives
+    
+    result = []
+    for sequences in groups.values():
+        if len(sequences) == 1:
+            result.append(make_concat(sequences[0]))
+            continue
+        
+        # Largo del prefijo (o sufijo) común a todo el grupo
+        common = min(len(sequence) for sequence in sequences)
+        length = 1
+        while length < common and all(
+                (sequence[-length - 1] if suffix else sequence[length]) ==
+                (sequences[0][-length - 1] if suffix else sequences[0][length])
+                for sequence in sequences):
+            length += 1
+        
+        if suffix:
+            shared = sequences[0][len(sequences[0]) - length:]
+            rests = make_alt([make_concat(sequence[:len(sequence) - length]) for sequence in sequences])
+            result.append(make_concat([rests, *shared]))
+        else:
+            shared = sequences[0][:length]
+            rests = make_alt([make_concat(sequence[length:]) for sequence in sequences])
+            result.append(make_concat([*shared, rests]))
+    
+    return result
+
+def make_alt(items):
+    """Construye la unión de nodos ya simplificados"""
+    alternatives = []
+    seen = set()
+    has_epsilon = False
+    for item in items:
+        for alternative in (item.items if isinstance(item, Alt) else (item,)):
+            if isinstance(alternative, Epsilon):
+                has_epsilon = True
+            elif alternative not in seen:
+                seen.add(alternative)
+                alternatives.append(alternative)
+    
+    if len(alternatives) > 1:
+        alternatives = _factor(alternatives, suffix=False)
+    if len(alternatives) > 1:
+        alternatives = _factor(alternatives, suffix=True)
+    
+    if not alternatives:
+        return EPSILON
+    node = alternatives[0] if len(alternatives) == 1 else Alt(tuple(alternatives))
+    
+    # ε|x equivale a x? (o a x si x ya acepta la cadena vacía)
+    if has_epsilon:
+        return make_repeat(node, '?')
+    return node
+
+def _simplify_node(node, items):
+    """Reconstruye un nodo a partir de sus hijos ya simplificados"""
+    if isinstance(node, (Epsilon, Symbol)):
+        return node
+    if isinstance(node, Repeat):
+        return make_repeat(items[0], node.op)
+    if isinstance(node, Concat):
+        return make_concat(items)
+    return make_alt(items)
+
+def simplify(node):
+    """Retorna un AST equivalente (mismo lenguaje) sin la estructura redundante"""
+    return fold(node, _simplify_node)
+
+def to_postfix(node):
+    """Escribe un AST en notación postfix"""
+    output = []
+    # La pila contiene nodos por escribir y operadores (cadenas) por emitir
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, str):
+            output.append(current)
+        elif isinstance(current, Epsilon):
+            output.append('ε')
+        elif isinstance(current, Symbol):
+            output.append(current.token)
+        elif isinstance(current, Repeat):
+            stack.append(current.op)
+            stack.append(current.node)
+        else:
+            operator = '.' if isinstance(current, Concat) else '|'
+            for item in reversed(current.items[1:]):
+                stack.append(operator)
+                stack.append(item)
+            stack.append(current.items[0])
+    return ''.join(output)
+
+def simplify_postfix(postfix):
+    """Simplifica una expresión en notación postfix y la retorna en la misma notación"""
+    return to_postfix(simplify(parse_postfix(postfix)))
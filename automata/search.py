@@ -0,0 +1,380 @@
+"""
+Búsqueda no anclada de todas las coincidencias de un AFD minimizado dentro de un texto.
+
+El texto se recorre hacia adelante. En cada posición empieza un hilo nuevo en el estado
+inicial y todos los hilos avanzan juntos por la tabla del AFD compilado; los hilos que
+llegan al mismo estado tienen el mismo futuro, por lo que se fusionan y se conserva el
+inicio más a la izquierda. Así, en cada posición donde un estado de aceptación está activo
+se conoce el inicio más a la izquierda de las coincidencias que terminan ahí, sin un
+recorrido hacia atrás ni un mapa de bits del texto completo.
+
+Los tramos sin coincidencias se recorren sin llevar los inicios, como un AFD cuyos estados
+son conjuntos de estados (con una caché acotada); cuando algún hilo acepta, los inicios se
+recuperan recorriendo de nuevo solo el tramo desde la última posición sin hilos vivos.
+
+Con semántica "más a la izquierda, más larga" una coincidencia solo es definitiva cuando
+ya no queda ningún hilo que pueda extenderla o empezar antes que ella. Si esos hilos mueren
+pronto, la búsqueda sigue desde el final de la coincidencia; si no, los hilos que empiezan
+después del final provisional se siguen en un nivel aparte, de modo que ningún tramo largo
+se recorre dos veces: cuando el final provisional avanza, los niveles siguientes se
+descartan y se vuelve a empezar desde la posición actual. El tiempo es lineal en el largo
+del texto y las coincidencias se generan en cuanto son definitivas, por lo que la memoria
+depende de los hilos activos y de las coincidencias pendientes, no del largo del texto.
+
+Las coincidencias se reportan como pares (inicio, fin) sin solaparse. El texto puede ser
+un str, bytes, bytearray o un mmap; los bytes se interpretan como Latin-1, de modo que los
+archivos grandes se recorren directamente desde el mapa de memoria sin convertirlos a
+cadenas de Python.
+"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+import mmap
+
+from .compiled_dfa import CompiledDFA
+
+# Máximo de conjuntos de estados que se guardan para el recorrido sin inicios
+MAX_SCAN_CONFIGS = 4096
+# Posiciones que se puede avanzar tras el final provisional, sin usar los niveles, aunque
+# la coincidencia sea más corta
+MAX_OVERSHOOT = 32
+
+class _ColumnMap(dict):
+    """Mapa símbolo -> columna que retorna la columna por defecto para símbolos desconocidos"""
+    __slots__ = ('default',)
+    
+    def __init__(self, symbol_map, default):
+        super().__init__(symbol_map)
+        self.default = default
+    
+    def __missing__(self, symbol):
+        return self.default
+
+def _merge(left, right):
+    """
+    Une dos listas de hilos (nivel, inicio) ordenadas por nivel, conservando en cada nivel
+    el inicio más a la izquierda
+    """
+    if left[-1][0] < right[0][0]:
+        left.extend(right)
+        return left
+    if right[-1][0] < left[0][0]:
+        right.extend(left)
+        return right
+    
+    merged = []
+    i = k = 0
+    while i < len(left) and k < len(right):
+        if left[i][0] == right[k][0]:
+            merged.append(min(left[i], right[k]))
+            i += 1
+            k += 1
+        elif left[i][0] < right[k][0]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[k])
+            k += 1
+    merged.extend(left[i:])
+    merged.extend(right[k:])
+    return merged
+
+class DFASearcher:
+    """Buscador de coincidencias no ancladas construido sobre un AFD minimizado"""
+    def __init__(self, dfa):
+        self.compiled = dfa if isinstance(dfa, CompiledDFA) else dfa.compile()
+        compiled = self.compiled
+        
+        # Columnas para textos en bytes (interpretados como Latin-1)
+        self._byte_columns = [compiled.symbol_map.get(chr(byte), compiled.default_column)
+                              for byte in range(256)]
+        self._char_columns = _ColumnMap(compiled.symbol_map, compiled.default_column)
+        
+        # Conjuntos de estados activos del recorrido sin inicios: el 0 es el conjunto vacío
+        self._config_ids = {frozenset(): 0}
+        self._configs = [frozenset()]
+        self._config_rows = [[None] * compiled.width]
+        self._config_final = bytearray(1)
+    
+    def _config(self, states):
+        """Retorna el identificador de un conjunto de estados, o None si ya no caben más"""
+        config = self._config_ids.get(states)
+        if config is None:
+            if len(self._configs) >= MAX_SCAN_CONFIGS:
+                return None
+            compiled = self.compiled
+            config = len(self._configs)
+            self._config_ids[states] = config
+            self._configs.append(states)
+            self._config_rows.append([None] * compiled.width)
+            self._config_final.append(any(compiled.accepting[state // compiled.width] for state in states))
+        return config
+    
+    def _step_config(self, config, column):
+        """
+        Calcula (y guarda) el conjunto que sigue a 'config' con un hilo nuevo en el estado
+        inicial al leer la columna 'column'
+        """
+        compiled = self.compiled
+        table = compiled.table
+        targets = {table[state + column] for state in self._configs[config]}
+        targets.add(table[compiled.start + column])
+        targets.discard(compiled.dead)
+        following = self._config(frozenset(targets))
+        if following is not None:
+            self._config_rows[config][column] = following
+        return following
+    
+    def _skip(self, codes, columns, position, states):
+        """
+        Recorre el texto desde 'position' con los hilos en 'states' sin llevar sus inicios,
+        como un AFD de conjuntos de estados, hasta que algún hilo acepta o se llena la caché.
+        Retorna la última posición recorrida en la que no quedaba ningún hilo vivo, o
+        'position' si no hubo ninguna; desde ahí los inicios se recuperan volviendo a
+        recorrer solo ese tramo
+        """
+        config = self._config(frozenset(states)) if states else 0
+        if config is None:
+            return position
+        rows = self._config_rows
+        final = self._config_final
+        mark = position
+        n = len(codes)
+        while position < n and not final[config]:
+            if not config:
+                mark = position
+            column = columns[codes[position]]
+            following = rows[config][column]
+            if following is None:
+                following = self._step_config(config, column)
+                if following is None:
+                    break
+            config = following
+            position += 1
+        if not config:
+            mark = position
+        return mark
+    
+    def _codes(self, text):
+        """Retorna (secuencia indexable de símbolos, mapa símbolo -> columna) para un texto"""
+        if isinstance(text, str):
+            return text, self._char_columns
+        return memoryview(text).cast('B'), self._byte_columns
+    
+    def finditer(self, text):
+        """Genera las coincidencias (inicio, fin) más a la izquierda y más largas, sin solaparse"""
+        codes, columns = self._codes(text)
+        compiled = self.compiled
+        table = compiled.table
+        accepting = compiled.accepting
+        width = compiled.width
+        dead = compiled.dead
+        start_state = compiled.start
+        n = len(codes)
+        if start_state == dead:
+            return
+        start_accepts = bool(accepting[start_state // width])
+        
+        # Hilos activos: estado -> lista de (nivel, inicio) ordenada por nivel. El nivel 0
+        # busca la próxima coincidencia; cada nivel siguiente busca la que vendría después
+        # de la coincidencia provisional del nivel anterior
+        nodes = {}
+        levels = deque([0])
+        # nivel -> [primer inicio permitido, inicio provisional, fin provisional]
+        pending = {0: [0, None, None]}
+        next_level = 1
+        
+        def drop_above(level):
+            """Descarta los niveles posteriores a 'level' y sus hilos"""
+            while levels[-1] > level:
+                del pending[levels.pop()]
+            for state in list(nodes):
+                entries = nodes[state]
+                del entries[bisect_right(entries, (level, n + 1)):]
+                if not entries:
+                    del nodes[state]
+        
+        def drop_later_starts(level, start):
+            """Descarta los hilos de un nivel que empiezan después de su coincidencia provisional"""
+            for state in list(nodes):
+                entries = nodes[state]
+                i = bisect_left(entries, (level, start + 1))
+                if i < len(entries) and entries[i][0] == level:
+                    del entries[i]
+                    if not entries:
+                        del nodes[state]
+        
+        def accept(level, start, end):
+            """Registra que un hilo del nivel 'level' acepta en la posición 'end'"""
+            nonlocal next_level
+            match = pending[level]
+            if match[1] is None or start < match[1]:
+                match[1] = start
+                drop_later_starts(level, start)
+            match[2] = end
+            drop_above(level)
+            # Después de una coincidencia vacía la siguiente empieza una posición más adelante
+            levels.append(next_level)
+            pending[next_level] = [end if end > start else end + 1, None, None]
+            next_level += 1
+        
+        # Estados (desplazamientos de fila) de aceptación, para detectarlos en bloque
+        accepting_states = {index * width for index, final in enumerate(accepting) if final}
+        
+        position = 0
+        while True:
+            level = levels[0]
+            if (not start_accepts and len(levels) == 1 and pending[level][1] is None
+                    and pending[level][0] <= position):
+                # Sin coincidencias pendientes todos los hilos son del mismo nivel y basta el
+                # inicio de cada estado. Se guardan en orden de inicio, así el primer hilo que
+                # llega a un estado es el de inicio más a la izquierda
+                starts = {}
+                if nodes:
+                    starts = {state: entries[0][1]
+                              for state, entries in sorted(nodes.items(), key=lambda item: item[1][0][1])}
+                # Los tramos sin coincidencias se recorren sin inicios; solo el tramo desde el
+                # último punto sin hilos vivos se vuelve a recorrer con ellos
+                mark = self._skip(codes, columns, position, starts)
+                if mark > position:
+                    position = mark
+                    starts = {}
+                while accepting_states.isdisjoint(starts):
+                    if not starts:
+                        while position < n and table[start_state + columns[codes[position]]] == dead:
+                            position += 1
+                    starts.setdefault(start_state, position)
+                    if position == n:
+                        return
+                    column = columns[codes[position]]
+                    advanced = {}
+                    for state, begin in starts.items():
+                        advanced.setdefault(table[state + column], begin)
+                    advanced.pop(dead, None)
+                    starts = advanced
+                    position += 1
+                
+                # Extensión de la coincidencia: solo siguen los hilos que empiezan a más
+                # tardar con ella. Si mueren pronto la coincidencia es definitiva y la búsqueda
+                # sigue desde su final, volviendo a recorrer ese tramo; si avanzan más que el
+                # largo de la coincidencia (y que MAX_OVERSHOOT) sin aceptar, se vuelve al final
+                # y se sigue con los niveles, así cada tramo se recorre a lo más dos veces
+                begin = min(starts[state] for state in accepting_states.intersection(starts))
+                threads = {state: start for state, start in starts.items() if start <= begin}
+                end = position
+                saved = threads
+                while position < n:
+                    if len(threads) == 1:
+                        # Con un solo hilo se avanza directamente por la tabla
+                        [(state, start)] = threads.items()
+                        accepted = None
+                        limit = min(n, end + max(MAX_OVERSHOOT, end - begin) + 1)
+                        while position < limit:
+                            state = table[state + columns[codes[position]]]
+                            position += 1
+                            if accepting[state // width]:
+                                accepted = state
+                                begin = start
+                                end = position
+                                limit = min(n, end + max(MAX_OVERSHOOT, end - begin) + 1)
+                            elif state == dead:
+                                break
+                        if accepted is not None:
+                            saved = {accepted: start}
+                        threads = {} if state == dead else {state: start}
+                        if not threads or position - end > max(MAX_OVERSHOOT, end - begin):
+                            break
+                        continue
+                    column = columns[codes[position]]
+                    advanced = {}
+                    for state, start in threads.items():
+                        advanced.setdefault(table[state + column], start)
+                    advanced.pop(dead, None)
+                    threads = advanced
+                    position += 1
+                    if not threads:
+                        break
+                    if not accepting_states.isdisjoint(threads):
+                        leader = min(threads[state] for state in accepting_states.intersection(threads))
+                        if leader < begin:
+                            begin = leader
+                            threads = {state: start for state, start in threads.items() if start <= begin}
+                        end = position
+                        saved = threads
+                    elif position - end > max(MAX_OVERSHOOT, end - begin):
+                        break
+                
+                if not threads or position == n:
+                    yield begin, end
+                    pending[level][0] = end
+                    position = end
+                    nodes = {}
+                    continue
+                position = end
+                nodes = {state: [(level, start)] for state, start in saved.items()}
+            
+            # Sin hilos activos se saltan las posiciones desde las que no empieza ningún hilo
+            if not nodes and not start_accepts:
+                while position < n and table[start_state + columns[codes[position]]] == dead:
+                    position += 1
+            
+            # Coincidencias que terminan aquí: solo cuenta el hilo del nivel más bajo
+            if not accepting_states.isdisjoint(nodes):
+                accept(*min(nodes[state][0] for state in accepting_states.intersection(nodes)),
+                       position)
+            
+            # Hilo nuevo en el nivel superior, salvo que ese nivel ya tenga una coincidencia
+            # provisional que empieza antes
+            top = levels[-1]
+            match = pending[top]
+            if match[0] <= position and match[1] is None:
+                entries = nodes.get(start_state)
+                if entries is None:
+                    nodes[start_state] = [(top, position)]
+                    added = True
+                else:
+                    added = entries[-1][0] != top
+                    if added:
+                        entries.append((top, position))
+                if added and start_accepts:
+                    accept(top, position, position)
+            
+            # La coincidencia del primer nivel es definitiva si ningún hilo de ese nivel sigue vivo
+            while pending[levels[0]][1] is not None:
+                if position < n:
+                    bottom = levels[0]
+                    for entries in nodes.values():
+                        if entries[0][0] == bottom:
+                            break
+                    else:
+                        entries = None
+                    if entries is not None:
+                        break
+                _, start, end = pending.pop(levels.popleft())
+                yield start, end
+            
+            if position == n:
+                return
+            
+            column = columns[codes[position]]
+            advanced = {}
+            for state, entries in nodes.items():
+                target = table[state + column]
+                if target == dead:
+                    continue
+                existing = advanced.get(target)
+                advanced[target] = entries if existing is None else _merge(existing, entries)
+            nodes = advanced
+            position += 1
+    
+    def findall(self, text):
+        """Retorna la lista de coincidencias (inicio, fin)"""
+        return list(self.finditer(text))
+    
+    def search_file(self, path):
+        """Genera las coincidencias de un archivo mapeándolo en memoria"""
+        with open(path, 'rb') as file:
+            if not file.seek(0, 2):
+                yield from self.finditer(b'')
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from self.finditer(mapped)
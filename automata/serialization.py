@@ -0,0 +1,154 @@
+"""
+Formato binario versionado para AFDs compilados.
+
+Estructura del archivo (little-endian):
+    cabecera     magic 'AFDC', versión (u16), reservado (u16), estados (u32), ancho (u32),
+                 inicio (u32), muerto (u32), columna por defecto (u32), símbolos (u32)
+    símbolos     por cada símbolo: columna (u32), largo en bytes (u16), texto UTF-8;
+                 rellenado hasta un múltiplo de 4 bytes
+    tabla        (estados + 1) * ancho enteros i32 con desplazamientos de fila
+    aceptación   estados + 1 bytes (1 si el estado es final)
+
+Al cargar, el archivo se mapea en memoria y la tabla se usa directamente desde el
+búfer, por lo que varios procesos comparten la misma copia en la caché de páginas.
+"""
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from .compiled_dfa import CompiledDFA
+
+MAGIC = b'AFDC'
+VERSION = 1
+HEADER = struct.Struct('<4sHH6I')
+SYMBOL_ENTRY = struct.Struct('<IH')
+
+def _align(offset):
+    """Redondea un desplazamiento al siguiente múltiplo de 4"""
+    return (offset + 3) & ~3
+
+def dumps(compiled):
+    """Serializa un AFD compilado a bytes"""
+    symbols = sorted(compiled.symbol_map.items(), key=lambda item: item[1])
+    parts = [HEADER.pack(MAGIC, VERSION, 0, compiled.num_states, compiled.width, compiled.start,
+                         compiled.dead, compiled.default_column, len(symbols))]
+    
+    for symbol, column in symbols:
+        encoded = symbol.encode('utf-8')
+        parts.append(SYMBOL_ENTRY.pack(column, len(encoded)))
+        parts.append(encoded)
+    
+    data = b''.join(parts)
+    data += b'\x00' * (_align(len(data)) - len(data))
+    
+    table = array('i', compiled.table)
+    if sys.byteorder == 'big':
+        table.byteswap()
+    
+    return data + table.tobytes() + bytes(compiled.accepting)
+
+def loads(buffer):
+    """
+    Reconstruye un AFD compilado a partir de un búfer (bytes, mmap, memoryview).
+    La tabla y el mapa de aceptación son vistas sobre el búfer, sin copiarlos.
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError("Archivo de autómata truncado")
+    
+    magic, version, _, num_states, width, start, dead, default_column, num_symbols = \
+        HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("El archivo no contiene un autómata compilado")
+    if version != VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    
+    offset = HEADER.size
+    symbol_map = {}
+    for _ in range(num_symbols):
+        column, length = SYMBOL_ENTRY.unpack_from(view, offset)
+        offset += SYMBOL_ENTRY.size
+        symbol_map[bytes(view[offset:offset + length]).decode('utf-8')] = column
+        offset += length
+    
+    offset = _align(offset)
+    table_size = (num_states + 1) * width * 4
+    if len(view) < offset + table_size + num_states + 1:
+        raise ValueError("Archivo de autómata truncado")
+    
+    table = view[offset:offset + table_size].cast('i')
+    if sys.byteorder == 'big':
+        table = array('i', table)
+        table.byteswap()
+    
+    offset += table_size
+    accepting = view[offset:offset + num_states + 1]
+    
+    return CompiledDFA(table, symbol_map, width, start, dead, default_column, accepting)
+
+def write_atomic(path, data):
+    """
+    Escribe bytes en un archivo de forma atómica: se escriben en un temporal del mismo
+    directorio que luego reemplaza al destino, por lo que un lector nunca ve un archivo a medias
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def save(compiled, path):
+    """Guarda un AFD compilado en disco de forma atómica"""
+    write_atomic(path, dumps(compiled))
+
+def load(path):
+    """Carga un AFD compilado mapeando el archivo en memoria"""
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(mapped)
+
+class DiskCache:
+    """
+    Caché en disco de AFDs compilados, direccionada por el hash de la expresión normalizada.
+    Las subclases pueden guardar otros valores redefiniendo 'suffix', _load y _dump.
+    """
+    suffix = '.afd'
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def path_for(self, key):
+        """Retorna la ruta del archivo correspondiente a una clave"""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}{self.suffix}")
+    
+    def get(self, key):
+        """Carga el valor de una clave, o None si no existe o es inválido"""
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return self._load(path)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key, value):
+        """Guarda el valor de una clave de forma atómica"""
+        write_atomic(self.path_for(key), self._dump(value))
+    
+    def _load(self, path):
+        """Carga el autómata de un archivo mapeándolo en memoria"""
+        return load(path)
+    
+    def _dump(self, compiled):
+        """Retorna los bytes que se guardan para un autómata"""
+        return dumps(compiled)
@@ -1,11 +1,13 @@
-from collections import defaultdict
+from .bitset import iter_bits
 
 class State:
     """Clase base para representar un estado en un autómata"""
+    __slots__ = ('state_id', 'is_final')
+    
     def __init__(self, state_id, is_final=False):
         self.state_id = state_id
         self.is_final = is_final
-        
+    
     def __str__(self):
         return f"State {self.state_id}{'(F)' if self.is_final else ''}"
     
@@ -14,20 +16,36 @@ class State:
 
 class NFAState(State):
     """Clase para representar un estado del AFN"""
+    __slots__ = ('transitions',)
+    
     def __init__(self, state_id, is_final=False):
         super().__init__(state_id, is_final)
-        self.transitions = defaultdict(list)  # símbolo -> lista de estados
+        self.transitions = {}  # símbolo -> lista de estados
     
     def add_transition(self, symbol, target_state):
         """Añade una transición desde este estado"""
-        self.transitions[symbol].append(target_state)
+        targets = self.transitions.get(symbol)
+        if targets is None:
+            self.transitions[symbol] = [target_state]
+        else:
+            targets.append(target_state)
 
 class DFAState(State):
     """Clase para representar un estado del AFD"""
-    def __init__(self, state_id, is_final=False, nfa_states=None):
+    __slots__ = ('transitions', 'nfa_mask', '_nfa_states')
+    
+    def __init__(self, state_id, is_final=False, nfa_states=None, nfa_mask=0):
         super().__init__(state_id, is_final)
         self.transitions = {}  # símbolo -> estado (único)
-        self.nfa_states = nfa_states or set()  # Conjunto de estados del AFN que representa
+        self.nfa_mask = nfa_mask  # Bitset de los estados del AFN que representa
+        self._nfa_states = nfa_states
+    
+    @property
+    def nfa_states(self):
+        """Conjunto de estados del AFN que representa (se construye desde el bitset al pedirlo)"""
+        if self._nfa_states is None:
+            self._nfa_states = frozenset(iter_bits(self.nfa_mask))
+        return self._nfa_states
     
     def add_transition(self, symbol, target_state):
         """Añade una transición desde este estado"""
@@ -35,4 +53,4 @@ class DFAState(State):
     
     def get_transition(self, symbol):
         """Obtiene el estado destino para un símbolo dado"""
-        return self.transitions.get(symbol)
\ No newline at end of file
+        return self.transitions.get(symbol)
@@ -0,0 +1,117 @@
+"""
+Verificación incremental de una entrada que llega por partes (archivos, sockets, streams de asyncio).
+
+El único contexto que se conserva entre partes es el estado actual del AFD compilado (y,
+para entradas en bytes, los bytes de un carácter UTF-8 incompleto), por lo que nunca hace
+falta tener la entrada completa en memoria y la lectura se puede cortar en cuanto el
+autómata llega al estado muerto.
+"""
+import codecs
+
+from .compiled_dfa import CompiledDFA
+
+# Tamaño de lectura por defecto de los ayudantes para archivos y streams
+CHUNK_SIZE = 64 * 1024
+
+class StreamMatcher:
+    """Verificador reanudable construido sobre un AFD (normalmente minimizado)"""
+    __slots__ = ('compiled', 'encoding', 'state', '_decoder')
+    
+    def __init__(self, dfa, encoding='utf-8'):
+        self.compiled = dfa if isinstance(dfa, CompiledDFA) else dfa.compile()
+        self.encoding = encoding
+        self.reset()
+    
+    def reset(self):
+        """Vuelve al estado inicial para verificar una nueva entrada"""
+        self.state = self.compiled.start
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+    
+    def _advance(self, text):
+        """Avanza el AFD con los caracteres de 'text'"""
+        compiled = self.compiled
+        table = compiled.table
+        get_column = compiled.symbol_map.get
+        default_column = compiled.default_column
+        terminal = compiled.terminal
+        state = self.state
+        
+        # En el estado muerto o en un sumidero de aceptación el resto del texto no importa
+        for symbol in text:
+            state = table[state + get_column(symbol, default_column)]
+            if state >= terminal:
+                break
+        
+        self.state = state
+    
+    def feed(self, chunk):
+        """
+        Procesa la siguiente parte de la entrada (str o bytes). Los bytes se decodifican de
+        forma incremental, por lo que un carácter puede quedar partido entre dos partes.
+        Retorna False si la entrada ya no puede pertenecer al lenguaje.
+        """
+        if self.state == self.compiled.dead:
+            return False
+        
+        if not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        self._advance(chunk)
+        
+        return self.state != self.compiled.dead
+    
+    def is_dead(self):
+        """Indica si ninguna continuación de la entrada puede ser aceptada"""
+        return self.state == self.compiled.dead
+    
+    def result(self):
+        """
+        Termina la entrada y retorna si pertenece al lenguaje. Lanza UnicodeDecodeError si
+        la entrada en bytes termina con un carácter incompleto.
+        """
+        if self.state != self.compiled.dead:
+            self._advance(self._decoder.decode(b'', final=True))
+        return self.compiled.is_accepting(self.state)
+
+def _read_function(source):
+    """Retorna la función de lectura de un archivo (read) o de un socket (recv)"""
+    if hasattr(source, 'recv'):
+        return source.recv
+    return source.read
+
+def match_stream(dfa, source, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """
+    Verifica el contenido de un archivo abierto (binario o de texto) o de un socket,
+    leyendo por partes y dejando de leer en cuanto la entrada queda rechazada.
+    """
+    matcher = StreamMatcher(dfa, encoding)
+    read = _read_function(source)
+    
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        if not matcher.feed(chunk):
+            return False
+    
+    return matcher.result()
+
+def match_file(dfa, path, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """Verifica el contenido completo de un archivo sin cargarlo en memoria"""
+    with open(path, 'rb') as f:
+        return match_stream(dfa, f, chunk_size, encoding)
+
+async def match_async_stream(dfa, reader, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """
+    Versión asíncrona de match_stream para un asyncio.StreamReader (o cualquier objeto
+    con un método 'read' asíncrono).
+    """
+    matcher = StreamMatcher(dfa, encoding)
+    
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        if not matcher.feed(chunk):
+            return False
+    
+    return matcher.result()
@@ -1,65 +1,107 @@
+from collections import deque
+import time
+
 from .dfa import DFA
+from .bitset import iter_bits, mask_from_states
+from .budget import DeterminizationBudgetExceeded
 
-def subset_construction(nfa):
-    """Implementa el algoritmo de construcción de subconjuntos para convertir un AFN a un AFD"""
+def subset_construction(nfa, max_states=None, max_transitions=None, deadline=None):
+    """
+    Implementa el algoritmo de construcción de subconjuntos para convertir un AFN a un AFD.
+    
+    Los conjuntos de estados del AFN se representan como enteros (bitsets). Las cerraduras
+    epsilon y las tablas de movimiento por símbolo se calculan una sola vez antes de
+    determinizar, por lo que cada transición del AFD es una unión de bitsets precalculados.
+    
+    Opcionalmente se limita el número de estados y de transiciones del AFD y el instante
+    (según time.perf_counter) en que debe terminar; si se supera algún límite se lanza
+    DeterminizationBudgetExceeded.
+    """
     if nfa.start_state is None:
         return None
     
     dfa = DFA()
+    dfa.symbol_classes = nfa.symbol_classes
+    
+    # Precalcular cerraduras epsilon y movimientos por símbolo de cada estado del AFN
+    closures = nfa.epsilon_closure_masks()
+    moves = nfa.move_masks(closures)
+    final_mask = mask_from_states(nfa.final_states)
+    
+    # Bitsets de los estados de aceptación de cada patrón (compilación de varios patrones)
+    tag_masks = {}
+    for state_id, pattern_id in nfa.accept_tags.items():
+        tag_masks[pattern_id] = tag_masks.get(pattern_id, 0) | (1 << state_id)
+    tag_masks = sorted(tag_masks.items())
+    
+    # Solo los estados con transiciones no epsilon aportan movimientos
+    moving_mask = mask_from_states(state_id for state_id, state_moves in enumerate(moves) if state_moves)
     
     # Calcular la cerradura epsilon del estado inicial del AFN
-    initial_closure = frozenset(nfa.epsilon_closure({nfa.start_state}))
+    initial_closure = closures[nfa.start_state]
     
     # Crear el estado inicial del AFD
     dfa_start = dfa.create_state(
-        is_final=bool(initial_closure.intersection(nfa.final_states)),
-        nfa_states=initial_closure
+        is_final=bool(initial_closure & final_mask),
+        nfa_mask=initial_closure
     )
     dfa.set_start_state(dfa_start)
+    if tag_masks:
+        _set_tags(dfa, dfa_start.state_id, initial_closure, tag_masks)
     
-    # Mapear el conjunto de estados del AFN al estado del AFD
+    # Mapear el bitset de estados del AFN al estado del AFD
     dfa.state_map[initial_closure] = dfa_start.state_id
     
     # Cola de conjuntos de estados por procesar
-    unmarked_states = [initial_closure]
+    unmarked_states = deque([initial_closure])
+    
+    transitions = 0
     
     while unmarked_states:
-        current_nfa_states = unmarked_states.pop(0)
-        current_dfa_state_id = dfa.state_map[current_nfa_states]
+        if deadline is not None and time.perf_counter() > deadline:
+            raise DeterminizationBudgetExceeded('deadline', len(dfa.states), transitions)
         
-        # Para cada símbolo del alfabeto
-        for symbol in nfa.alphabet:
-            # Calcular el conjunto de estados alcanzables con el símbolo
-            move_result = nfa.move(current_nfa_states, symbol)
-            
-            # Calcular la cerradura epsilon del resultado
-            next_nfa_states = frozenset(nfa.epsilon_closure(move_result))
+        current_nfa_states = unmarked_states.popleft()
+        current_dfa_state = dfa.states[dfa.state_map[current_nfa_states]]
+        
+        # Unir los movimientos precalculados de cada estado del AFN, agrupados por símbolo
+        next_by_symbol = {}
+        for state_id in iter_bits(current_nfa_states & moving_mask):
+            for symbol, mask in moves[state_id]:
+                next_by_symbol[symbol] = next_by_symbol.get(symbol, 0) | mask
+        
+        for symbol in sorted(next_by_symbol):
+            next_nfa_states = next_by_symbol[symbol]
             
-            # Si el conjunto no está vacío
-            if next_nfa_states:
-                # Verificar si ya existe un estado para este conjunto
-                if next_nfa_states not in dfa.state_map:
-                    # Crear un nuevo estado en el AFD
-                    is_final = bool(next_nfa_states.intersection(nfa.final_states))
-                    new_dfa_state = dfa.create_state(is_final=is_final, nfa_states=next_nfa_states)
-                    
-                    # Mapear el conjunto al nuevo estado
-                    dfa.state_map[next_nfa_states] = new_dfa_state.state_id
-                    
-                    # Marcar el nuevo conjunto para procesamiento
-                    unmarked_states.append(next_nfa_states)
+            # Verificar si ya existe un estado para este conjunto
+            next_dfa_state_id = dfa.state_map.get(next_nfa_states)
+            if next_dfa_state_id is None:
+                if max_states is not None and len(dfa.states) >= max_states:
+                    raise DeterminizationBudgetExceeded('states', len(dfa.states), transitions)
                 
-                # Añadir la transición
-                next_dfa_state_id = dfa.state_map[next_nfa_states]
-                dfa.add_transition(
-                    dfa.states[current_dfa_state_id],
-                    symbol,
-                    dfa.states[next_dfa_state_id]
+                # Crear un nuevo estado en el AFD
+                new_dfa_state = dfa.create_state(
+                    is_final=bool(next_nfa_states & final_mask),
+                    nfa_mask=next_nfa_states
                 )
+                next_dfa_state_id = new_dfa_state.state_id
+                if tag_masks:
+                    _set_tags(dfa, next_dfa_state_id, next_nfa_states, tag_masks)
+                
+                # Mapear el conjunto al nuevo estado y marcarlo para procesamiento
+                dfa.state_map[next_nfa_states] = next_dfa_state_id
+                unmarked_states.append(next_nfa_states)
+            
+            # Añadir la transición
+            dfa.add_transition(current_dfa_state, symbol, dfa.states[next_dfa_state_id])
+            transitions += 1
+            if max_transitions is not None and transitions > max_transitions:
+                raise DeterminizationBudgetExceeded('transitions', len(dfa.states), transitions)
     
-    # Eliminar estados inalcanzables
-    unreachable = dfa.get_unreachable_states()
-    if unreachable:
-        dfa.remove_states(unreachable)
-    
-    return dfa
\ No newline at end of file
+    return dfa
+
+def _set_tags(dfa, state_id, nfa_states, tag_masks):
+    """Etiqueta un estado del AFD con los patrones cuyos estados de aceptación contiene"""
+    tags = frozenset(pattern_id for pattern_id, mask in tag_masks if nfa_states & mask)
+    if tags:
+        dfa.state_tags[state_id] = tags
@@ -0,0 +1 @@
+# Benchmarks del procesador de expresiones regulares
\ No newline at end of file
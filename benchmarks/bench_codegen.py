@@ -0,0 +1,60 @@
+"""
+Benchmark del verificador generado (codegen).
+
+Compara DFA.simulate, el AFD compilado en forma tabular (match) y la función de Python
+generada para el AFD (compile_specialized) sobre el mismo lote de cadenas, e informa
+además el costo de generar y cargar el código.
+
+Uso:
+    python -m benchmarks.bench_codegen
+"""
+import random
+import time
+
+from main import compile_regex, compile_specialized
+
+# (expresión, alfabeto de las cadenas); las últimas tienen estados con ciclos largos
+PATTERNS = [
+    ('(a|b)*abb', 'ab'),
+    ('(a|b)*a(a|b)(a|b)', 'ab'),
+    ('[a-z]+@[a-z]+', 'abcxyz@'),
+    ('[^]*abc', 'abcdefgh'),
+    ('a[a-z]*z', 'abcdefghijklmnopqrstuvwxyz'),
+]
+BATCH_SIZE = 20000
+MAX_LENGTH = 200
+
+def random_strings(count, alphabet, seed=42):
+    """Genera un lote reproducible de cadenas aleatorias"""
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, MAX_LENGTH)))
+            for _ in range(count)]
+
+def timed(function):
+    """Ejecuta una función y retorna (resultado, segundos)"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    """Función principal"""
+    print(f"Lote de {BATCH_SIZE} cadenas de largo 0-{MAX_LENGTH}\n")
+    print(f"{'expresión':<20} {'simulate (s)':>13} {'match (s)':>10} {'generado (s)':>13} "
+          f"{'generar (ms)':>13} {'vs match':>9}")
+    
+    for regex, alphabet in PATTERNS:
+        strings = random_strings(BATCH_SIZE, alphabet)
+        dfa = compile_regex(regex)
+        compiled = dfa.compile()
+        specialized, generate_time = timed(lambda: compile_specialized(regex))
+        
+        expected, simulate_time = timed(lambda: [dfa.simulate(s) for s in strings])
+        _, match_time = timed(lambda: [compiled.match(s) for s in strings])
+        results, specialized_time = timed(lambda: [specialized(s) for s in strings])
+        
+        assert results == expected
+        print(f"{regex:<20} {simulate_time:>13.3f} {match_time:>10.3f} {specialized_time:>13.3f} "
+              f"{generate_time * 1000:>13.2f} {match_time / specialized_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
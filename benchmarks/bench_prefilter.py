@@ -0,0 +1,60 @@
+"""
+Benchmark del prefiltro de literales.
+
+Compara el AFD compilado (match) con y sin el prefiltro de literales sobre lotes de cadenas
+donde la mayoría no pertenece al lenguaje, e informa qué fracción descarta el prefiltro
+sin recorrer el autómata.
+
+Uso:
+    python -m benchmarks.bench_prefilter
+"""
+import random
+import time
+
+from main import compile_regex
+
+# (expresión, alfabeto de las cadenas)
+PATTERNS = [
+    ('(a|b)*abb', 'ab'),
+    ('[a-z]+@mail', 'abcxyz@mail'),
+    ('x(abc|zabcy)+q', 'abcqxyz'),
+    ('[^]*error[^]*', 'abcdeorx '),
+]
+BATCH_SIZE = 20000
+MAX_LENGTH = 200
+
+def random_strings(count, alphabet, seed=42):
+    """Genera un lote reproducible de cadenas aleatorias"""
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, MAX_LENGTH)))
+            for _ in range(count)]
+
+def timed(function):
+    """Ejecuta una función y retorna (resultado, segundos)"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    """Función principal"""
+    print(f"Lote de {BATCH_SIZE} cadenas de largo 0-{MAX_LENGTH}\n")
+    print(f"{'expresión':<16} {'sin prefiltro (s)':>18} {'con prefiltro (s)':>18} "
+          f"{'descartadas':>12} {'aceleración':>12}")
+    
+    for regex, alphabet in PATTERNS:
+        strings = random_strings(BATCH_SIZE, alphabet)
+        dfa = compile_regex(regex)
+        filtered = dfa.compile()
+        plain = dfa.compile()
+        plain.prefilter = None
+        
+        expected, plain_time = timed(lambda: [plain.match(s) for s in strings])
+        results, filtered_time = timed(lambda: [filtered.match(s) for s in strings])
+        assert results == expected
+        
+        rejected = sum(1 for s in strings if not filtered.prefilter.check(s)) / len(strings)
+        print(f"{regex:<16} {plain_time:>18.3f} {filtered_time:>18.3f} {rejected:>11.0%} "
+              f"{plain_time / filtered_time:>11.1f}x")
+
+if __name__ == "__main__":
+    main()
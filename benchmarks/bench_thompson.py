@@ -0,0 +1,57 @@
+"""
+Benchmark de la construcción de Thompson.
+
+Mide el tiempo de construcción del AFN para expresiones de largo creciente y
+muestra el tiempo por símbolo, que debe mantenerse aproximadamente constante
+si la construcción es lineal.
+
+Uso:
+    python -m benchmarks.bench_thompson
+"""
+import time
+
+from main import preprocess_regex, format_regex, infix_to_postfix, thompson_construction
+
+SIZES = [100, 200, 400, 800, 1600, 3200]
+
+def concatenation_pattern(n):
+    """Concatenación larga: abcabcabc..."""
+    return ''.join('abc'[i % 3] for i in range(n))
+
+def alternation_pattern(n):
+    """Alternación ancha agrupada con cerradura: (a|b|c|...)*"""
+    return '(' + '|'.join('abc'[i % 3] for i in range(n)) + ')*'
+
+def nested_pattern(n):
+    """Bloques con operadores unarios: (ab)*(ab)+(ab)?..."""
+    ops = '*+?'
+    return ''.join(f"(ab){ops[i % 3]}" for i in range(n // 2))
+
+FAMILIES = {
+    'concatenación': concatenation_pattern,
+    'alternación': alternation_pattern,
+    'anidada': nested_pattern,
+}
+
+def time_thompson(regex, repeat=5):
+    """Retorna el mejor tiempo (en segundos) de construir el AFN de una expresión"""
+    postfix = infix_to_postfix(format_regex(preprocess_regex(regex)))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        thompson_construction(postfix)
+        best = min(best, time.perf_counter() - start)
+    return best, len(postfix)
+
+def main():
+    """Función principal"""
+    for name, family in FAMILIES.items():
+        print(f"Familia: {name}")
+        print(f"{'símbolos':>10} {'tiempo (ms)':>12} {'µs/símbolo':>12}")
+        for size in SIZES:
+            elapsed, length = time_thompson(family(size))
+            print(f"{length:>10} {elapsed * 1e3:>12.3f} {elapsed * 1e6 / length:>12.3f}")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Verificación diferencial de los motores de verificación.
+
+Genera expresiones regulares aleatorias (con clases de caracteres, epsilon y todos los
+operadores) y compara, para todas las cadenas cortas sobre un alfabeto fijo, el resultado
+de cada motor del proyecto con el del módulo re de Python: DFA.simulate, NFA.simulate,
+CompiledDFA.match y match_many, el AFD serializado, LazyDFA, CompactNFA, Glushkov, el
+código generado, StreamMatcher y el AFD de la expresión sin simplificar. Además verifica,
+para un conjunto fijo de expresiones, el motor que elige compile_engine (las expresiones con
+un AFD pequeño no deben descartarse por la estimación del presupuesto). Termina con código
+de salida 1 si algún motor difiere.
+
+Uso:
+    python -m benchmarks.check_equivalence [--count N] [--seed S]
+"""
+import argparse
+import itertools
+import random
+import re
+import sys
+
+from automata.compact_nfa import CompactNFA
+from automata.codegen import generate_matcher
+from automata.dfa_minimization import minimize_dfa
+from automata.glushkov import GlushkovAutomaton
+from automata.lazy_dfa import LazyDFA
+from automata.serialization import dumps, loads
+from automata.stream import StreamMatcher
+from automata.subset_construction import subset_construction
+from main import (format_regex, infix_to_postfix, preprocess_regex, regex_to_postfix,
+                  thompson_construction, build_prefilter, compile_engine)
+
+# Alfabeto de las cadenas de prueba; 'd' no aparece como símbolo en las expresiones
+ALPHABET = 'abcd'
+SYMBOLS = ['a', 'b', 'c', 'ε', '[ab]', '[b-c]', '[^a]', '[^]']
+MAX_DEPTH = 4
+MAX_LENGTH = 5
+
+# (expresión, motor que debe elegir compile_engine, alfabeto de las cadenas de prueba)
+ENGINE_CASES = [
+    ('[0-9]*' + '[0-9]' * 14, 'dfa', '09a'),
+    ('[a-z]*' + '[a-z]' * 14, 'dfa', 'az0'),
+    ('(ab|cd)*' + '(ab|cd)' * 14, 'dfa', 'abcd'),
+    ('((a|b)*c)*a' + '(a|b)' * 16, 'dfa', 'abc'),
+    ('(a|b)*c' + '(a|b)' * 14, 'dfa', 'abc'),
+    ('[a-z]*x' + '[0-9]' * 14, 'dfa', 'ax09'),
+    ('[^]*abc' + '[0-9]' * 13, 'dfa', 'abc09'),
+    ('(a|b)*a' + '(a|b)' * 30, 'glushkov', 'ab'),
+]
+ENGINE_STRINGS = 300
+
+def random_regex(rng, depth=MAX_DEPTH):
+    """Genera una expresión regular aleatoria en la sintaxis del proyecto"""
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(SYMBOLS)
+    op = rng.choice('.|*+?')
+    if op == '.':
+        return '(' + random_regex(rng, depth - 1) + random_regex(rng, depth - 1) + ')'
+    if op == '|':
+        return '(' + random_regex(rng, depth - 1) + '|' + random_regex(rng, depth - 1) + ')'
+    return '(' + random_regex(rng, depth - 1) + ')' + op
+
+def to_python(regex):
+    """Traduce una expresión del proyecto a la sintaxis del módulo re"""
+    return regex.replace('[^]', r'[\s\S]').replace('ε', '(?:)')
+
+def test_strings():
+    """Todas las cadenas sobre ALPHABET de largo 0 a MAX_LENGTH"""
+    return [''.join(chars) for length in range(MAX_LENGTH + 1)
+            for chars in itertools.product(ALPHABET, repeat=length)]
+
+def engines(regex):
+    """Construye los motores de una expresión y retorna {nombre: función de verificación}"""
+    postfix = regex_to_postfix(regex)
+    nfa = thompson_construction(postfix)
+    dfa = minimize_dfa(subset_construction(nfa))
+    dfa.prefilter = build_prefilter(postfix)
+    compiled = dfa.compile()
+    restored = loads(dumps(compiled))
+    restored.prefilter = compiled.prefilter
+    glushkov = GlushkovAutomaton.from_postfix(postfix).matcher()
+    
+    # La forma postfix sin simplificar debe reconocer el mismo lenguaje
+    raw_postfix = infix_to_postfix(format_regex(preprocess_regex(regex)))
+    raw_dfa = minimize_dfa(subset_construction(thompson_construction(raw_postfix)))
+    
+    def stream_match(text):
+        matcher = StreamMatcher(compiled)
+        matcher.feed(text.encode('utf-8'))
+        return matcher.result()
+    
+    return {
+        'dfa': dfa.simulate,
+        'nfa': nfa.simulate,
+        'compiled': compiled.match,
+        'serialized': restored.match,
+        'lazy_dfa': LazyDFA(nfa).match,
+        'compact_nfa': CompactNFA.from_nfa(nfa).simulate,
+        'glushkov': glushkov.match,
+        'codegen': generate_matcher(compiled),
+        'stream': stream_match,
+        'unsimplified': raw_dfa.simulate,
+    }
+
+def check(regex, strings):
+    """Compara todos los motores con re sobre las cadenas; retorna los motores que difieren"""
+    expected = [re.fullmatch(to_python(regex), s) is not None for s in strings]
+    failures = []
+    matchers = engines(regex)
+    
+    for name, match in matchers.items():
+        for s, result in zip(strings, expected):
+            if match(s) != result:
+                failures.append((name, s, result))
+                break
+    
+    if list(matchers['compiled'].__self__.match_many(strings)) != expected:
+        failures.append(('match_many', None, None))
+    
+    return failures
+
+def check_engine(regex, engine, alphabet, rng):
+    """
+    Verifica el motor que elige compile_engine para una expresión y compara sus resultados
+    con re sobre cadenas aleatorias; retorna las diferencias como en check
+    """
+    name, matcher = compile_engine(regex)
+    failures = []
+    if name != engine:
+        failures.append((f"compile_engine eligió '{name}' en lugar de '{engine}'", None, None))
+    
+    pattern = re.compile(to_python(regex))
+    for _ in range(ENGINE_STRINGS):
+        s = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = pattern.fullmatch(s) is not None
+        if matcher.match(s) != expected:
+            failures.append((name, s, expected))
+            break
+    
+    return failures
+
+def parse_args(argv=None):
+    """Procesa los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Verificación diferencial de los motores contra el módulo re")
+    parser.add_argument("--count", type=int, default=300, help="Número de expresiones aleatorias")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    strings = test_strings()
+    mismatches = 0
+    
+    for _ in range(args.count):
+        regex = random_regex(rng)
+        for name, text, expected in check(regex, strings):
+            mismatches += 1
+            if text is None:
+                print(f"{regex}: {name} difiere")
+            else:
+                print(f"{regex}: {name} retorna {not expected} para {text!r} (re: {expected})")
+    
+    for regex, engine, alphabet in ENGINE_CASES:
+        for name, text, expected in check_engine(regex, engine, alphabet, rng):
+            mismatches += 1
+            if text is None:
+                print(f"{regex}: {name}")
+            else:
+                print(f"{regex}: {name} retorna {not expected} para {text!r} (re: {expected})")
+    
+    print(f"{args.count} expresiones, {len(strings)} cadenas cada una, "
+          f"{len(ENGINE_CASES)} casos de motor, {mismatches} diferencias")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
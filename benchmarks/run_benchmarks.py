@@ -0,0 +1,195 @@
+"""
+Suite de benchmarks reproducible del procesador de expresiones regulares.
+
+Mide por separado cada etapa del proceso (análisis a postfix, Thompson, subconjuntos,
+minimización, compilación a tabla y simulación) sobre familias de expresiones de tamaño
+creciente, incluyendo casos patológicos. Para cada caso registra además el número de
+estados y transiciones de cada autómata y el pico de memoria de la compilación.
+
+Uso:
+    python -m benchmarks.run_benchmarks --output resultados.json
+    python -m benchmarks.run_benchmarks --baseline base.json --threshold 0.25
+
+Con --baseline se comparan los tiempos contra un archivo JSON generado antes con
+--output; si alguna etapa es más lenta que la base por encima del umbral, el programa
+termina con código 1.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from main import regex_to_postfix, thompson_construction
+from automata.subset_construction import subset_construction
+from automata.dfa_minimization import minimize_dfa
+from automata.metrics import count_transitions
+
+STAGES = ['parse', 'thompson', 'subset', 'minimize', 'compile', 'simulate', 'match']
+
+# Tiempos menores a este valor (en segundos) son demasiado ruidosos para compararlos
+MIN_COMPARABLE_TIME = 1e-4
+
+def concatenation(n):
+    """Concatenación larga: abcabc... de n símbolos"""
+    return ''.join('abc'[i % 3] for i in range(n))
+
+def nested_stars(n):
+    """Cerraduras anidadas: ((((a*)b*)*c*)*...)"""
+    regex = 'a*'
+    for i in range(n):
+        regex = f"({regex}{'bc'[i % 2]}*)*"
+    return regex
+
+def exponential(n):
+    """(a|b)*a(a|b)...(a|b): el AFD mínimo tiene 2^(n+1) estados"""
+    return '(a|b)*a' + '(a|b)' * n
+
+def wide_alternation(n):
+    """Alternación de n palabras distintas de largo 4"""
+    words = []
+    for i in range(n):
+        word = ''
+        for _ in range(4):
+            word += 'abcd'[i % 4]
+            i //= 4
+        words.append(word)
+    return '(' + '|'.join(words) + ')*'
+
+FAMILIES = {
+    'concatenation': (concatenation, [50, 100, 200, 400], [50, 100]),
+    'nested_stars': (nested_stars, [2, 4, 8, 16], [2, 4]),
+    'exponential': (exponential, [4, 6, 8, 10], [4, 6]),
+    'wide_alternation': (wide_alternation, [8, 16, 32, 64], [8, 16]),
+}
+
+def best_time(function, repeat, setup=None):
+    """Retorna (resultado, mejor tiempo en segundos) de varias ejecuciones"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        result = function(argument) if setup else function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def sample_strings(regex, count=200, length=200, seed=0):
+    """Genera cadenas reproducibles con los símbolos que aparecen en la expresión"""
+    alphabet = sorted(set(regex) - set('()|*+?.ε'))
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+def run_case(family, size, regex, repeat):
+    """Ejecuta todas las etapas para una expresión y retorna sus métricas"""
+    times = {}
+    
+    postfix, times['parse'] = best_time(lambda: regex_to_postfix(regex), repeat)
+    nfa, times['thompson'] = best_time(lambda: thompson_construction(postfix), repeat)
+    dfa, times['subset'] = best_time(lambda: subset_construction(nfa), repeat)
+    
+    # minimize_dfa modifica el AFD de entrada, así que cada repetición usa uno nuevo
+    dfa_states = len(dfa.states)
+    dfa_transitions = count_transitions(dfa)
+    minimized, times['minimize'] = best_time(minimize_dfa, repeat, setup=lambda: subset_construction(nfa))
+    compiled, times['compile'] = best_time(minimized.compile, repeat)
+    
+    strings = sample_strings(regex)
+    _, times['simulate'] = best_time(lambda: [minimized.simulate(s) for s in strings], repeat)
+    _, times['match'] = best_time(lambda: [compiled.match(s) for s in strings], repeat)
+    
+    # Pico de memoria de la compilación completa, medido aparte para no afectar los tiempos
+    tracemalloc.start()
+    minimize_dfa(subset_construction(thompson_construction(regex_to_postfix(regex))))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'family': family,
+        'size': size,
+        'regex_length': len(regex),
+        'times': times,
+        'nfa_states': len(nfa.states),
+        'nfa_transitions': count_transitions(nfa),
+        'dfa_states': dfa_states,
+        'dfa_transitions': dfa_transitions,
+        'min_dfa_states': len(minimized.states),
+        'min_dfa_transitions': count_transitions(minimized),
+        'peak_memory_bytes': peak,
+    }
+
+def case_key(case):
+    """Clave que identifica un caso para compararlo con la base"""
+    return f"{case['family']}[{case['size']}]"
+
+def compare(results, baseline, threshold):
+    """Retorna la lista de regresiones (caso, etapa, tiempo base, tiempo actual)"""
+    base_cases = {case_key(case): case for case in baseline['cases']}
+    regressions = []
+    for case in results['cases']:
+        base = base_cases.get(case_key(case))
+        if base is None:
+            continue
+        for stage, elapsed in case['times'].items():
+            base_time = base['times'].get(stage)
+            if base_time and base_time >= MIN_COMPARABLE_TIME and elapsed > base_time * (1 + threshold):
+                regressions.append((case_key(case), stage, base_time, elapsed))
+    return regressions
+
+def parse_args(argv=None):
+    """Interpreta los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del procesador de expresiones regulares")
+    parser.add_argument('--output', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="Archivo JSON de resultados previos para comparar")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Aumento relativo de tiempo tolerado antes de reportar una regresión")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por etapa (se usa la mejor)")
+    parser.add_argument('--quick', action='store_true', help="Usar solo los tamaños pequeños")
+    parser.add_argument('--family', action='append', choices=sorted(FAMILIES),
+                        help="Limitar la ejecución a una familia (se puede repetir)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+    cases = []
+    
+    print(f"{'caso':<22} " + ' '.join(f"{stage:>9}" for stage in STAGES) + f" {'AFD mín':>8} {'memoria':>10}")
+    for family in args.family or FAMILIES:
+        generator, sizes, quick_sizes = FAMILIES[family]
+        for size in (quick_sizes if args.quick else sizes):
+            case = run_case(family, size, generator(size), args.repeat)
+            cases.append(case)
+            print(f"{case_key(case):<22} "
+                  + ' '.join(f"{case['times'][stage] * 1e3:>9.3f}" for stage in STAGES)
+                  + f" {case['min_dfa_states']:>8} {case['peak_memory_bytes'] // 1024:>8}KB")
+    print("(tiempos en ms)")
+    
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'cases': cases,
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"Resultados guardados en {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for key, stage, base_time, elapsed in regressions:
+            print(f"Regresión en {key} ({stage}): {base_time * 1e3:.3f} ms -> {elapsed * 1e3:.3f} ms")
+        if regressions:
+            return 1
+        print(f"Sin regresiones respecto a {args.baseline} (umbral {args.threshold:.0%})")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,40 @@
 from automata.nfa import NFA
+from automata.charclass import CharClass, split_tokens, is_class_token, compress_alphabet
+from automata.regex_ast import simplify_postfix
+from automata.glushkov import GlushkovAutomaton
+from automata.lazy_dfa import LazyDFA
+from automata.codegen import generate_source, load_source
+from automata.prefilter import Prefilter
+from automata.budget import CompileBudget, DeterminizationBudgetExceeded
 from automata.subset_construction import subset_construction
 from automata.dfa_minimization import minimize_dfa
+from automata.cache import LRUCache
+from automata.multi_pattern import MultiPatternMatcher
+from automata.metrics import CompileMetrics, JSONLinesExporter, measure
 from collections import defaultdict, deque
-import networkx as nx
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import itertools
 import os
 
+# Caché de AFDs minimizados indexada por la forma postfix normalizada de la expresión
+compile_cache = LRUCache(maxsize=128)
+
+# Callbacks que reciben un CompileMetrics por cada expresión procesada con process_regex o process_block
+metrics_hooks = []
+
+# Presupuesto por defecto de la determinización (estados, transiciones y tiempo)
+compile_budget = CompileBudget()
+
+# Motores de respaldo de las expresiones que superaron el presupuesto, indexados por su forma postfix
+fallback_cache = LRUCache(maxsize=128)
+
+# Máximo de posiciones para usar el simulador de Glushkov como respaldo; por encima se usa el AFD perezoso
+MAX_GLUSHKOV_POSITIONS = 512
+
+# Máximo de lotes enviados al pool de procesos sin consumir sus resultados, por proceso
+MAX_PENDING_CHUNKS = 2
+
 def get_precedence(c):
     """
     Calcula la precedencia para operadores de expresiones regulares.
@@ -45,16 +74,18 @@ def preprocess_regex(regex):
 def format_regex(regex):
     """
     Formatea la expresión regular añadiendo operadores de concatenación explícitos ('.').
+    Las clases de caracteres entre corchetes se tratan como un único símbolo.
     """
     result = []
+    tokens = split_tokens(regex)
     i = 0
     
-    while i < len(regex):
-        current = regex[i]
+    while i < len(tokens):
+        current = tokens[i]
         result.append(current)
         
-        if i + 1 < len(regex):
-            next_char = regex[i + 1]
+        if i + 1 < len(tokens):
+            next_char = tokens[i + 1]
             
             # Añadir operador de concatenación si es necesario
             if (current not in ['(', '|'] and next_char not in [')', '|', '*', '+', '?']):
@@ -71,7 +102,7 @@ def infix_to_postfix(regex):
     postfix = []
     stack = []
     
-    for char in regex:
+    for char in split_tokens(regex):
         if char == '(':
             stack.append(char)
         elif char == ')':
@@ -92,293 +123,307 @@ def infix_to_postfix(regex):
     
     return ''.join(postfix)
 
-def thompson_construction(postfix):
+def thompson_fragment(nfa, postfix):
     """
-    Construye un AFN usando el algoritmo de Thompson a partir de una expresión regular en notación postfix
+    Construye el fragmento de Thompson de una expresión postfix dentro de un AFN existente.
+    Cada estado se crea una sola vez y los fragmentos se enlazan por los ids de sus
+    estados inicial y de aceptación, por lo que el costo es lineal en el largo de la expresión.
+    Retorna la tupla (estado_inicial, estado_de_aceptación).
     """
     stack = []
     
-    for symbol in postfix:
+    for symbol in split_tokens(postfix):
         if symbol == '.':
             # Concatenación
             if len(stack) < 2:
                 raise ValueError("Expresión inválida para concatenación")
             
-            nfa2 = stack.pop()
-            nfa1 = stack.pop()
-            
-            # Crear un nuevo NFA para la concatenación
-            result = NFA()
-            
-            # Copiar estados y transiciones de nfa1
-            for state_id, state in nfa1.states.items():
-                new_state = result.create_state(is_final=state.is_final)
-                if state_id == nfa1.start_state:
-                    result.set_start_state(new_state)
-            
-            # Mapeo de estados antiguos a nuevos para nfa1
-            state_map_nfa1 = {old_id: new_id for old_id, new_id in 
-                             zip(nfa1.states.keys(), list(result.states.keys())[:len(nfa1.states)])}
-            
-            # Copiar transiciones de nfa1
-            for old_id, state in nfa1.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map_nfa1[old_id], symbol, 
-                                             result.states[state_map_nfa1[target]])
-            
-            # Copiar estados de nfa2
-            start_idx = len(result.states)
-            for state_id, state in nfa2.states.items():
-                new_state = result.create_state(is_final=state.is_final)
-            
-            # Mapeo de estados antiguos a nuevos para nfa2
-            state_map_nfa2 = {old_id: new_id for old_id, new_id in 
-                             zip(nfa2.states.keys(), list(result.states.keys())[start_idx:])}
+            start2, accept2 = stack.pop()
+            start1, accept1 = stack.pop()
             
-            # Copiar transiciones de nfa2
-            for old_id, state in nfa2.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map_nfa2[old_id], symbol, 
-                                             result.states[state_map_nfa2[target]])
+            # Conectar la aceptación del primer fragmento con el inicio del segundo
+            nfa.add_epsilon_transition(accept1, start2)
             
-            # Conectar nfa1 con nfa2
-            for old_id in nfa1.final_states:
-                result.add_epsilon_transition(state_map_nfa1[old_id], 
-                                            result.states[state_map_nfa2[nfa2.start_state]])
-                result.states[state_map_nfa1[old_id]].is_final = False
-            
-            # Actualizar estados finales
-            result.final_states = {state_map_nfa2[fs] for fs in nfa2.final_states}
-            
-            stack.append(result)
+            stack.append((start1, accept2))
         
         elif symbol == '|':
             # Unión
             if len(stack) < 2:
                 raise ValueError("Expresión inválida para unión")
             
-            nfa2 = stack.pop()
-            nfa1 = stack.pop()
-            
-            # Crear un nuevo AFN con un nuevo estado inicial y final
-            result = NFA()
-            start = result.create_state()
-            result.set_start_state(start)
-            
-            end = result.create_state(is_final=True)
-            
-            # Copiar estados y transiciones de nfa1
-            start_idx = len(result.states)
-            for state_id, state in nfa1.states.items():
-                new_state = result.create_state(is_final=False)  # No hay estados finales internos
-            
-            # Mapeo de estados antiguos a nuevos para nfa1
-            state_map_nfa1 = {old_id: new_id for old_id, new_id in 
-                             zip(nfa1.states.keys(), list(result.states.keys())[start_idx:start_idx+len(nfa1.states)])}
-            
-            # Copiar transiciones de nfa1
-            for old_id, state in nfa1.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map_nfa1[old_id], symbol, 
-                                             result.states[state_map_nfa1[target]])
-            
-            # Copiar estados de nfa2
-            start_idx = len(result.states)
-            for state_id, state in nfa2.states.items():
-                new_state = result.create_state(is_final=False)  # No hay estados finales internos
-            
-            # Mapeo de estados antiguos a nuevos para nfa2
-            state_map_nfa2 = {old_id: new_id for old_id, new_id in 
-                             zip(nfa2.states.keys(), list(result.states.keys())[start_idx:])}
-            
-            # Copiar transiciones de nfa2
-            for old_id, state in nfa2.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map_nfa2[old_id], symbol, 
-                                             result.states[state_map_nfa2[target]])
-            
-            # Añadir transiciones epsilon desde el nuevo estado inicial a los estados iniciales de nfa1 y nfa2
-            result.add_epsilon_transition(start.state_id, result.states[state_map_nfa1[nfa1.start_state]])
-            result.add_epsilon_transition(start.state_id, result.states[state_map_nfa2[nfa2.start_state]])
-            
-            # Añadir transiciones epsilon desde los estados finales de nfa1 y nfa2 al nuevo estado final
-            for final_state in nfa1.final_states:
-                result.add_epsilon_transition(state_map_nfa1[final_state], end)
+            start2, accept2 = stack.pop()
+            start1, accept1 = stack.pop()
             
-            for final_state in nfa2.final_states:
-                result.add_epsilon_transition(state_map_nfa2[final_state], end)
+            start = nfa.create_state().state_id
+            accept = nfa.create_state().state_id
             
-            # Actualizar estados finales
-            result.final_states = {end.state_id}
+            nfa.add_epsilon_transition(start, start1)
+            nfa.add_epsilon_transition(start, start2)
+            nfa.add_epsilon_transition(accept1, accept)
+            nfa.add_epsilon_transition(accept2, accept)
             
-            stack.append(result)
+            stack.append((start, accept))
         
-        elif symbol == '*':
-            # Cerradura de Kleene
-            if not stack:
-                raise ValueError("Expresión inválida para cerradura de Kleene")
-            
-            nfa = stack.pop()
-            
-            # Crear un nuevo AFN con un nuevo estado inicial y final
-            result = NFA()
-            start = result.create_state()
-            result.set_start_state(start)
-            
-            end = result.create_state(is_final=True)
-            
-            # Copiar estados y transiciones de nfa
-            start_idx = len(result.states)
-            for state_id, state in nfa.states.items():
-                new_state = result.create_state(is_final=False)  # No hay estados finales internos
-            
-            # Mapeo de estados antiguos a nuevos
-            state_map = {old_id: new_id for old_id, new_id in 
-                        zip(nfa.states.keys(), list(result.states.keys())[start_idx:])}
-            
-            # Copiar transiciones
-            for old_id, state in nfa.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map[old_id], symbol, 
-                                             result.states[state_map[target]])
-            
-            # Añadir transición epsilon desde el nuevo estado inicial al estado inicial de nfa
-            result.add_epsilon_transition(start.state_id, result.states[state_map[nfa.start_state]])
-            
-            # Añadir transición epsilon desde el nuevo estado inicial al nuevo estado final
-            result.add_epsilon_transition(start.state_id, end)
-            
-            # Añadir transiciones epsilon desde los estados finales de nfa al estado inicial de nfa y al nuevo estado final
-            for final_state in nfa.final_states:
-                result.add_epsilon_transition(state_map[final_state], result.states[state_map[nfa.start_state]])
-                result.add_epsilon_transition(state_map[final_state], end)
-            
-            # Actualizar estados finales
-            result.final_states = {end.state_id}
-            
-            stack.append(result)
-        
-        elif symbol == '+':
-            # Una o más ocurrencias
-            if not stack:
-                raise ValueError("Expresión inválida para una o más ocurrencias")
-            
-            nfa = stack.pop()
-            
-            # Crear un nuevo AFN con un nuevo estado inicial y final
-            result = NFA()
-            start = result.create_state()
-            result.set_start_state(start)
-            
-            end = result.create_state(is_final=True)
-            
-            # Copiar estados y transiciones de nfa
-            start_idx = len(result.states)
-            for state_id, state in nfa.states.items():
-                new_state = result.create_state(is_final=False)  # No hay estados finales internos
-            
-            # Mapeo de estados antiguos a nuevos
-            state_map = {old_id: new_id for old_id, new_id in 
-                        zip(nfa.states.keys(), list(result.states.keys())[start_idx:])}
-            
-            # Copiar transiciones
-            for old_id, state in nfa.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map[old_id], symbol, 
-                                             result.states[state_map[target]])
-            
-            # Añadir transición epsilon desde el nuevo estado inicial al estado inicial de nfa
-            result.add_epsilon_transition(start.state_id, result.states[state_map[nfa.start_state]])
-            
-            # Añadir transiciones epsilon desde los estados finales de nfa al estado inicial de nfa y al nuevo estado final
-            for final_state in nfa.final_states:
-                result.add_epsilon_transition(state_map[final_state], result.states[state_map[nfa.start_state]])
-                result.add_epsilon_transition(state_map[final_state], end)
-            
-            # Actualizar estados finales
-            result.final_states = {end.state_id}
-            
-            stack.append(result)
-        
-        elif symbol == '?':
-            # Cero o una ocurrencia
+        elif symbol in ('*', '+', '?'):
+            # Cerradura de Kleene, una o más ocurrencias y cero o una ocurrencia
             if not stack:
+                if symbol == '*':
+                    raise ValueError("Expresión inválida para cerradura de Kleene")
+                if symbol == '+':
+                    raise ValueError("Expresión inválida para una o más ocurrencias")
                 raise ValueError("Expresión inválida para cero o una ocurrencia")
             
-            nfa = stack.pop()
-            
-            # Crear un nuevo AFN con un nuevo estado inicial y final
-            result = NFA()
-            start = result.create_state()
-            result.set_start_state(start)
-            
-            end = result.create_state(is_final=True)
-            
-            # Copiar estados y transiciones de nfa
-            start_idx = len(result.states)
-            for state_id, state in nfa.states.items():
-                new_state = result.create_state(is_final=False)  # No hay estados finales internos
-            
-            # Mapeo de estados antiguos a nuevos
-            state_map = {old_id: new_id for old_id, new_id in 
-                        zip(nfa.states.keys(), list(result.states.keys())[start_idx:])}
-            
-            # Copiar transiciones
-            for old_id, state in nfa.states.items():
-                for symbol, targets in state.transitions.items():
-                    for target in targets:
-                        result.add_transition(state_map[old_id], symbol, 
-                                             result.states[state_map[target]])
+            inner_start, inner_accept = stack.pop()
             
-            # Añadir transición epsilon desde el nuevo estado inicial al estado inicial de nfa
-            result.add_epsilon_transition(start.state_id, result.states[state_map[nfa.start_state]])
+            start = nfa.create_state().state_id
+            accept = nfa.create_state().state_id
             
-            # Añadir transición epsilon desde el nuevo estado inicial al nuevo estado final
-            result.add_epsilon_transition(start.state_id, end)
+            nfa.add_epsilon_transition(start, inner_start)
+            nfa.add_epsilon_transition(inner_accept, accept)
             
-            # Añadir transiciones epsilon desde los estados finales de nfa al nuevo estado final
-            for final_state in nfa.final_states:
-                result.add_epsilon_transition(state_map[final_state], end)
+            # '*' y '?' aceptan la cadena vacía
+            if symbol != '+':
+                nfa.add_epsilon_transition(start, accept)
             
-            # Actualizar estados finales
-            result.final_states = {end.state_id}
+            # '*' y '+' permiten repetir el fragmento
+            if symbol != '?':
+                nfa.add_epsilon_transition(inner_accept, inner_start)
             
-            stack.append(result)
+            stack.append((start, accept))
         
         else:
             # Símbolo
-            nfa = NFA()
-            start = nfa.create_state()
-            nfa.set_start_state(start)
-            
-            end = nfa.create_state(is_final=True)
+            start = nfa.create_state().state_id
+            accept = nfa.create_state().state_id
             
             # Manejar epsilon (ε)
             if symbol == 'ε':
-                nfa.add_epsilon_transition(start.state_id, end)
+                nfa.add_epsilon_transition(start, accept)
+            elif is_class_token(symbol):
+                # Clase de caracteres: una sola transición etiquetada con el conjunto
+                nfa.add_transition(start, CharClass.parse(symbol), accept)
             else:
-                nfa.add_transition(start.state_id, symbol, end)
-                nfa.alphabet.add(symbol)
-            
-            nfa.final_states = {end.state_id}
+                nfa.add_transition(start, symbol, accept)
             
-            stack.append(nfa)
+            stack.append((start, accept))
     
     if len(stack) != 1:
         raise ValueError("Expresión regular inválida")
     
     return stack[0]
 
+def thompson_construction(postfix):
+    """
+    Construye un AFN usando el algoritmo de Thompson a partir de una expresión regular en notación postfix.
+    Si la expresión usa clases de caracteres, el alfabeto se comprime en clases de equivalencia.
+    """
+    nfa = NFA()
+    start, accept = thompson_fragment(nfa, postfix)
+    
+    nfa.set_start_state(nfa.states[start])
+    nfa.states[accept].is_final = True
+    nfa.final_states = {accept}
+    compress_alphabet(nfa)
+    
+    return nfa
+
+def regex_to_postfix(regex, metrics=None):
+    """
+    Normaliza una expresión regular y la convierte a notación postfix.
+    Expresiones que solo difieren en espacios o en la escritura de epsilon producen el mismo resultado.
+    La forma postfix se simplifica sobre su AST (ver regex_ast), por lo que expresiones como
+    'a**' y 'a*' también comparten el mismo resultado.
+    """
+    with measure(metrics, 'preprocess'):
+        preprocessed_regex = preprocess_regex(regex)
+    with measure(metrics, 'format'):
+        formatted_regex = format_regex(preprocessed_regex)
+    with measure(metrics, 'postfix'):
+        postfix = infix_to_postfix(formatted_regex)
+    with measure(metrics, 'simplify'):
+        return simplify_postfix(postfix)
+
+def determinize(postfix, nfa, metrics=None, budget=None):
+    """
+    Convierte el AFN de una expresión en AFD respetando el presupuesto (por defecto
+    'compile_budget'). Antes de construir nada se descarta la expresión si la estimación
+    del tamaño de su AFD ya supera el límite de estados. Lanza DeterminizationBudgetExceeded.
+    """
+    if budget is None:
+        budget = compile_budget
+    
+    with measure(metrics, 'estimate'):
+        budget.check_estimate(postfix)
+    with measure(metrics, 'subset'):
+        return subset_construction(nfa, budget.max_states, budget.max_transitions, budget.deadline())
+
+def build_prefilter(postfix):
+    """
+    Construye el prefiltro de literales (largo, prefijo, sufijo y subcadenas obligatorias)
+    de una expresión en notación postfix. Retorna None si no descarta ninguna cadena.
+    """
+    prefilter = Prefilter.from_postfix(postfix)
+    return None if prefilter.is_trivial() else prefilter
+
+def compile_regex(regex, cache=None, metrics=None, budget=None):
+    """
+    Compila una expresión regular a su AFD minimizado, reutilizando la caché LRU.
+    Si no se indica una caché se usa la caché global 'compile_cache'.
+    Si se indica un CompileMetrics, se registran los tiempos y tamaños de cada etapa.
+    El AFD lleva el prefiltro de literales de la expresión, que descarta las cadenas que no
+    pueden pertenecer al lenguaje antes de recorrer el autómata.
+    Lanza DeterminizationBudgetExceeded si la determinización supera el presupuesto.
+    """
+    if cache is None:
+        cache = compile_cache
+    
+    postfix = regex_to_postfix(regex, metrics)
+    minimized_dfa = cache.get(postfix)
+    if metrics is not None:
+        metrics.cache_hit = minimized_dfa is not None
+    
+    if minimized_dfa is None:
+        with measure(metrics, 'thompson'):
+            nfa = thompson_construction(postfix)
+        if metrics is not None:
+            metrics.record_automaton('nfa', nfa)
+        dfa = determinize(postfix, nfa, metrics, budget)
+        if metrics is not None:
+            metrics.record_automaton('dfa', dfa)
+        with measure(metrics, 'minimize'):
+            minimized_dfa = minimize_dfa(dfa)
+        with measure(metrics, 'prefilter'):
+            minimized_dfa.prefilter = build_prefilter(postfix)
+        cache.put(postfix, minimized_dfa)
+    
+    if metrics is not None:
+        metrics.record_automaton('min_dfa', minimized_dfa)
+        metrics.counts['alphabet_size'] = len(minimized_dfa.alphabet)
+    
+    return minimized_dfa
+
+def compile_matcher(regex, disk_cache=None):
+    """
+    Compila una expresión regular a un AFD en forma tabular (CompiledDFA).
+    Si se indica una caché en disco (DiskCache), el autómata se carga desde ella
+    mapeando el archivo en memoria, o se guarda ahí después de compilarlo.
+    La tabla se construye una sola vez por AFD de la caché y se comparte entre las llamadas.
+    """
+    if disk_cache is None:
+        return compile_regex(regex).get_compiled()
+    
+    postfix = regex_to_postfix(regex)
+    compiled = disk_cache.get(postfix)
+    if compiled is None:
+        compiled = compile_regex(regex).get_compiled()
+        disk_cache.put(postfix, compiled)
+    else:
+        # El formato en disco solo guarda la tabla; el prefiltro se recalcula (es lineal)
+        compiled.prefilter = build_prefilter(postfix)
+    
+    return compiled
+
+def compile_specialized(regex, source_cache=None):
+    """
+    Compila una expresión regular a una función de Python generada especialmente para su
+    AFD minimizado (ver codegen). Si se indica una caché de código (SourceCache), el código
+    se carga desde ella o se guarda ahí después de generarlo. Retorna la función match(text).
+    """
+    postfix = regex_to_postfix(regex)
+    source = source_cache.get(postfix) if source_cache is not None else None
+    if source is None:
+        source = generate_source(compile_regex(regex).get_compiled())
+        if source_cache is not None:
+            source_cache.put(postfix, source)
+    
+    return load_source(source)
+
+def compile_glushkov(regex):
+    """
+    Compila una expresión regular a su autómata de posiciones de Glushkov y retorna su
+    simulador con paralelismo de bits (BitParallelMatcher). No determiniza, por lo que el
+    costo de compilación es lineal en el número de posiciones incluso para expresiones
+    cuyo AFD crece exponencialmente.
+    """
+    return GlushkovAutomaton.from_postfix(regex_to_postfix(regex)).matcher()
+
+def fallback_matcher(regex, budget=None):
+    """
+    Construye un motor que no determiniza para una expresión cuyo AFD supera el presupuesto.
+    Retorna (nombre del motor, matcher): 'glushkov' (BitParallelMatcher) si la expresión
+    tiene a lo sumo MAX_GLUSHKOV_POSITIONS posiciones, o 'lazy_dfa' (LazyDFA con la caché
+    de estados limitada al presupuesto de estados) si no.
+    """
+    if budget is None:
+        budget = compile_budget
+    
+    postfix = regex_to_postfix(regex)
+    engine = fallback_cache.get(postfix)
+    if engine is None:
+        automaton = GlushkovAutomaton.from_postfix(postfix)
+        if automaton.num_positions <= MAX_GLUSHKOV_POSITIONS:
+            engine = ('glushkov', automaton.matcher())
+        else:
+            engine = ('lazy_dfa', LazyDFA(thompson_construction(postfix), max_states=budget.max_states or 10000))
+        fallback_cache.put(postfix, engine)
+    
+    return engine
+
+def compile_engine(regex, metrics=None, budget=None):
+    """
+    Compila una expresión con el motor más rápido que cabe en el presupuesto y retorna
+    (nombre del motor, matcher con método match): 'dfa' (AFD minimizado en forma tabular)
+    o, si la determinización supera el presupuesto, el motor de fallback_matcher.
+    """
+    try:
+        engine = ('dfa', compile_regex(regex, metrics=metrics, budget=budget).get_compiled())
+    except DeterminizationBudgetExceeded as e:
+        engine = _fallback_engine(regex, e, metrics, budget)
+    
+    if metrics is not None:
+        metrics.engine = engine[0]
+    return engine
+
+def _fallback_engine(regex, error, metrics=None, budget=None):
+    """Retorna el motor de respaldo de una expresión y registra el motivo en las métricas"""
+    if metrics is not None:
+        metrics.fallback = str(error)
+    return fallback_matcher(regex, budget)
+
+def compile_patterns(regexes):
+    """
+    Compila varias expresiones regulares en un único AFD minimizado. Los AFN de Thompson
+    de cada expresión se unen bajo un estado inicial común y cada estado de aceptación se
+    etiqueta con el índice de su expresión, que también define su prioridad (menor gana).
+    """
+    regexes = list(regexes)
+    nfa = NFA()
+    start = nfa.create_state()
+    nfa.set_start_state(start)
+    
+    for pattern_id, regex in enumerate(regexes):
+        try:
+            fragment_start, fragment_accept = thompson_fragment(nfa, regex_to_postfix(regex))
+        except ValueError as e:
+            raise ValueError(f"Patrón {pattern_id} ({regex}): {e}") from e
+        
+        nfa.add_epsilon_transition(start.state_id, fragment_start)
+        nfa.states[fragment_accept].is_final = True
+        nfa.final_states.add(fragment_accept)
+        nfa.accept_tags[fragment_accept] = pattern_id
+    
+    compress_alphabet(nfa)
+    minimized_dfa = minimize_dfa(subset_construction(nfa))
+    return MultiPatternMatcher(minimized_dfa, regexes)
+
 def visualize_automaton(automaton, title, filename):
     """
-    Visualiza un autómata (NFA o DFA) usando networkx y matplotlib
+    Visualiza un autómata (NFA o DFA) usando networkx y matplotlib.
+    Las bibliotecas de graficación se importan aquí para que el modo sin visualización no las cargue.
     """
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    
     G = nx.DiGraph()
     
     # Añadir nodos
@@ -442,95 +487,352 @@ def visualize_automaton(automaton, title, filename):
     plt.savefig(f'automata_images/{filename}.png', dpi=300, bbox_inches='tight')
     plt.close()
 
-def read_regex_from_file(file_path):
-    """Lee expresiones regulares y cadenas de prueba desde un archivo"""
-    regex_data = []
-    
+def iter_regex_file(file_path):
+    """
+    Genera pares (expresión, cadena de prueba) leyendo el archivo línea por línea.
+    Cada expresión va seguida de su cadena de prueba; si el archivo termina, se usa la cadena vacía.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            # Leer la expresión regular
+            regex_line = line.strip()
+            if regex_line:
+                # Leer la siguiente línea para la cadena de prueba
+                test_string = next(file, '').strip()
+                yield regex_line, test_string
+
+def _iter_block_strings(file):
+    """Genera las cadenas de un bloque hasta la siguiente línea en blanco; un bloque vacío da la cadena vacía"""
+    empty = True
+    for line in file:
+        test_string = line.strip()
+        if not test_string:
+            break
+        empty = False
+        yield test_string
+    if empty:
+        yield ""
+
+def iter_regex_blocks(file_path):
+    """
+    Genera pares (expresión, iterador de cadenas) con el formato extendido: cada expresión va
+    seguida de cualquier número de cadenas de prueba hasta la siguiente línea en blanco.
+    Un bloque sin cadenas se prueba con la cadena vacía. Las cadenas se leen del archivo a
+    medida que se consumen, por lo que ni siquiera un bloque se carga completo en memoria;
+    las que no se consumen se descartan antes de pasar al siguiente bloque.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            regex_line = line.strip()
+            if not regex_line:
+                continue
+            
+            test_strings = _iter_block_strings(file)
+            yield regex_line, test_strings
+            for _ in test_strings:
+                pass
+
+def iter_safely(entries, file_path):
+    """Recorre las entradas de un archivo informando los errores de lectura sin propagarlos"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-            
-            i = 0
-            while i < len(lines):
-                # Leer la expresión regular
-                regex_line = lines[i].strip()
-                if regex_line:
-                    # Leer la siguiente línea para la cadena de prueba
-                    if i + 1 < len(lines):
-                        test_string = lines[i + 1].strip()
-                        regex_data.append((regex_line, test_string))
-                        i += 2
-                    else:
-                        # Si no hay cadena de prueba, usar cadena vacía
-                        regex_data.append((regex_line, ""))
-                        i += 1
-                else:
-                    i += 1
-    
+        yield from entries
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {file_path}")
     except Exception as e:
         print(f"Error al leer el archivo: {e}")
-    
-    return regex_data
 
-def process_regex(regex, test_string, index):
-    """Procesa una expresión regular y verifica si una cadena pertenece al lenguaje"""
-    try:
-        # Preprocesar la expresión regular
-        preprocessed_regex = preprocess_regex(regex)
-        
-        # Formatear la expresión regular (añadir operador de concatenación explícito)
-        formatted_regex = format_regex(preprocessed_regex)
-        
-        # Convertir de infix a postfix
-        postfix = infix_to_postfix(formatted_regex)
-        
-        # Construir el AFN usando el algoritmo de Thompson
+def read_regex_from_file(file_path):
+    """Lee expresiones regulares y cadenas de prueba desde un archivo"""
+    return list(iter_safely(iter_regex_file(file_path), file_path))
+
+def render_automata(regex, index, metrics=None, budget=None):
+    """
+    Construye y visualiza el AFN, el AFD y el AFD minimizado; retorna el AFD minimizado.
+    Lanza DeterminizationBudgetExceeded (después de visualizar el AFN) si la determinización
+    supera el presupuesto.
+    """
+    # Preprocesar, formatear y convertir la expresión regular a postfix
+    postfix = regex_to_postfix(regex, metrics)
+    
+    # Construir el AFN usando el algoritmo de Thompson
+    with measure(metrics, 'thompson'):
         nfa = thompson_construction(postfix)
-        
-        # Visualizar el AFN
+    
+    # Visualizar el AFN
+    with measure(metrics, 'render'):
         visualize_automaton(nfa, f"AFN para {regex}", f"nfa_{index}")
-        
-        # Convertir el AFN a AFD usando el algoritmo de subconjuntos
-        dfa = subset_construction(nfa)
-        
-        # Visualizar el AFD
+    
+    if metrics is not None:
+        metrics.record_automaton('nfa', nfa)
+    
+    # Convertir el AFN a AFD usando el algoritmo de subconjuntos
+    dfa = determinize(postfix, nfa, metrics, budget)
+    
+    if metrics is not None:
+        metrics.record_automaton('dfa', dfa)
+    
+    # Visualizar el AFD
+    with measure(metrics, 'render'):
         visualize_automaton(dfa, f"AFD para {regex}", f"dfa_{index}")
-        
-        # Minimizar el AFD
-        minimized_dfa = minimize_dfa(dfa)
-        
-        # Visualizar el AFD minimizado
+    
+    # Minimizar el AFD, reutilizando el resultado si la expresión ya se compiló
+    minimized_dfa = compile_cache.get(postfix)
+    if metrics is not None:
+        metrics.cache_hit = minimized_dfa is not None
+    if minimized_dfa is None:
+        with measure(metrics, 'minimize'):
+            minimized_dfa = minimize_dfa(dfa)
+        with measure(metrics, 'prefilter'):
+            minimized_dfa.prefilter = build_prefilter(postfix)
+        compile_cache.put(postfix, minimized_dfa)
+    
+    if metrics is not None:
+        metrics.record_automaton('min_dfa', minimized_dfa)
+        metrics.counts['alphabet_size'] = len(minimized_dfa.alphabet)
+    
+    # Visualizar el AFD minimizado
+    with measure(metrics, 'render'):
         visualize_automaton(minimized_dfa, f"AFD Minimizado para {regex}", f"minimized_dfa_{index}")
+    
+    return minimized_dfa
+
+def select_engine(regex, index, render=True, metrics=None, budget=None):
+    """
+    Elige el motor con el que se verifican las cadenas de una expresión y retorna
+    (nombre del motor, matcher). Con render=True también se visualizan los autómatas.
+    Si la determinización supera el presupuesto se avisa y se usa un motor de respaldo.
+    """
+    if render:
+        try:
+            engine = ('dfa', render_automata(regex, index, metrics, budget).get_compiled())
+        except DeterminizationBudgetExceeded as e:
+            engine = _fallback_engine(regex, e, metrics, budget)
+        if metrics is not None:
+            metrics.engine = engine[0]
+    else:
+        engine = compile_engine(regex, metrics, budget)
+    
+    if engine[0] != 'dfa':
+        print(f"Aviso: la expresión {regex} supera el presupuesto de determinización; "
+              f"se usa el motor '{engine[0]}'")
+    return engine
+
+def process_regex(regex, test_string, index, render=True, on_metrics=None, budget=None):
+    """
+    Procesa una expresión regular y verifica si una cadena pertenece al lenguaje.
+    Con render=False no se generan visualizaciones y el AFD minimizado se obtiene de la caché.
+    Si se indica on_metrics (o hay callbacks en 'metrics_hooks'), cada callback recibe un
+    CompileMetrics con los tiempos por etapa, los tamaños de los autómatas y el motivo de falla.
+    Si la determinización supera el presupuesto (por defecto 'compile_budget'), la cadena
+    se verifica con un motor que no determiniza (ver select_engine).
+    """
+    callbacks = [on_metrics] if on_metrics is not None else metrics_hooks
+    metrics = CompileMetrics(regex, index) if callbacks else None
+    
+    try:
+        _, matcher = select_engine(regex, index, render, metrics, budget)
         
-        # Simular el AFD con la cadena de prueba
-        result = minimized_dfa.simulate(test_string)
-        
-        return "si" if result else "no"
+        # Verificar la cadena de prueba
+        with measure(metrics, 'simulate'):
+            result = "si" if matcher.match(test_string) else "no"
     
     except Exception as e:
         print(f"Error al procesar la expresión regular: {e}")
-        return "Error"
+        result = "Error"
+        if metrics is not None:
+            metrics.failure = f"{type(e).__name__}: {e}"
+    
+    if metrics is not None:
+        metrics.result = result
+        for callback in callbacks:
+            callback(metrics)
+    
+    return result
+
+def process_block(regex, test_strings, index, render=True, on_metrics=None, budget=None):
+    """
+    Compila una expresión regular una sola vez y verifica cada cadena del bloque.
+    Genera los resultados en orden; si la expresión no compila, todas las cadenas dan "Error".
+    Las cadenas pueden venir de cualquier iterable y se consumen a medida que se verifican.
+    Si se indica on_metrics (o hay callbacks en 'metrics_hooks'), al terminar el bloque cada
+    callback recibe un solo CompileMetrics: la compilación se mide una vez, la etapa
+    'simulate' acumula la verificación de todas las cadenas y 'result' es la lista de resultados.
+    """
+    callbacks = [on_metrics] if on_metrics is not None else metrics_hooks
+    metrics = CompileMetrics(regex, index) if callbacks else None
+    results = []
+    
+    try:
+        try:
+            _, matcher = select_engine(regex, index, render, metrics, budget)
+        except Exception as e:
+            print(f"Error al procesar la expresión regular: {e}")
+            if metrics is not None:
+                metrics.failure = f"{type(e).__name__}: {e}"
+            for _ in test_strings:
+                results.append("Error")
+                yield "Error"
+            return
+        
+        for test_string in test_strings:
+            with measure(metrics, 'simulate'):
+                result = "si" if matcher.match(test_string) else "no"
+            results.append(result)
+            yield result
+    
+    finally:
+        if metrics is not None:
+            metrics.result = results
+            metrics.counts['strings'] = len(results)
+            for callback in callbacks:
+                callback(metrics)
+
+def _process_entry(entry):
+    """Procesa una entrada (índice, expresión, cadena) dentro de un proceso trabajador"""
+    index, regex, test_string, render, on_metrics, budget = entry
+    return process_regex(regex, test_string, index, render, on_metrics, budget)
+
+def _process_chunk(function, chunk):
+    """Aplica una función a un lote de entradas dentro de un proceso trabajador"""
+    return [function(entry) for entry in chunk]
+
+def _map_in_windows(function, entries, workers=None, chunksize=16):
+    """
+    Como ProcessPoolExecutor.map, pero las entradas se envían en lotes de 'chunksize' a
+    medida que se consumen los resultados: nunca hay más de MAX_PENDING_CHUNKS lotes por
+    proceso sin consumir, así la entrada no se carga completa en memoria. Genera los
+    resultados en el orden de la entrada.
+    """
+    workers = workers or os.cpu_count() or 1
+    entries = iter(entries)
+    pending = deque()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < workers * MAX_PENDING_CHUNKS:
+                chunk = list(itertools.islice(entries, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_process_chunk, function, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+def process_batch(regex_data, workers=None, chunksize=16, render=True, on_metrics=None, budget=None):
+    """
+    Procesa pares (expresión, cadena) en paralelo con un pool de procesos.
+    Genera los resultados en el mismo orden de la entrada, que puede ser cualquier iterable:
+    se lee a medida que se consumen los resultados (ver _map_in_windows). Un error en una
+    entrada solo afecta a esa entrada, igual que en process_regex. Con workers=None se usan
+    todos los núcleos disponibles. on_metrics debe poder enviarse a otros procesos
+    (por ejemplo, un JSONLinesExporter).
+    """
+    entries = ((i, regex, test_string, render, on_metrics, budget)
+               for i, (regex, test_string) in enumerate(regex_data, 1))
+    return _map_in_windows(_process_entry, entries, workers, chunksize)
+
+def _process_block_entry(entry):
+    """Procesa un bloque (índice, expresión, cadenas) dentro de un proceso trabajador"""
+    index, regex, test_strings, render, on_metrics, budget = entry
+    return list(process_block(regex, test_strings, index, render, on_metrics, budget))
+
+def process_blocks_batch(blocks, workers=None, chunksize=4, render=True, on_metrics=None, budget=None):
+    """
+    Procesa bloques (expresión, cadenas) en paralelo; genera las listas de resultados en orden.
+    Los bloques se leen a medida que se consumen los resultados y las cadenas de cada bloque
+    se guardan en una lista solo mientras el bloque está en un lote pendiente.
+    on_metrics debe poder enviarse a otros procesos (por ejemplo, un JSONLinesExporter).
+    """
+    entries = ((i, regex, list(test_strings), render, on_metrics, budget)
+               for i, (regex, test_strings) in enumerate(blocks, 1))
+    return _map_in_windows(_process_block_entry, entries, workers, chunksize)
+
+def parse_args(argv=None):
+    """Interpreta los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Procesador de expresiones regulares")
+    parser.add_argument('archivo', nargs='?', default="expresiones_regulares.txt",
+                        help="Archivo con expresiones regulares y cadenas de prueba")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Número de procesos para el modo paralelo (0 = todos los núcleos)")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="Número de entradas enviadas a cada proceso por lote")
+    parser.add_argument('--multi', action='store_true',
+                        help="Formato extendido: cada expresión va seguida de varias cadenas hasta una línea en blanco")
+    parser.add_argument('--metrics', metavar='ARCHIVO',
+                        help="Agregar las métricas de cada expresión como líneas JSON a este archivo")
+    parser.add_argument('--headless', action='store_true',
+                        help="No generar visualizaciones (no importa networkx ni matplotlib)")
+    parser.add_argument('--max-states', type=int, default=compile_budget.max_states,
+                        help="Máximo de estados del AFD antes de usar un motor sin determinizar (0 = sin límite)")
+    parser.add_argument('--max-transitions', type=int, default=compile_budget.max_transitions,
+                        help="Máximo de transiciones del AFD (0 = sin límite)")
+    parser.add_argument('--timeout', type=float, default=compile_budget.timeout,
+                        help="Tiempo máximo en segundos para determinizar cada expresión (0 = sin límite)")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     """Función principal"""
-    file_path = "expresiones_regulares.txt"
-    regex_data = read_regex_from_file(file_path)
+    args = parse_args(argv)
+    render = not args.headless
+    on_metrics = JSONLinesExporter(args.metrics) if args.metrics else None
+    budget = CompileBudget(args.max_states or None, args.max_transitions or None, args.timeout or None)
     
-    if not regex_data:
+    if args.multi:
+        entries = iter_safely(iter_regex_blocks(args.archivo), args.archivo)
+    else:
+        entries = iter_safely(iter_regex_file(args.archivo), args.archivo)
+    
+    # Revisar la primera entrada sin cargar el resto del archivo
+    first = next(entries, None)
+    if first is None:
         print("No se encontraron expresiones regulares para procesar.")
         return
+    entries = itertools.chain([first], entries)
     
     print("Procesando expresiones regulares...\n")
     
-    for i, (regex, test_string) in enumerate(regex_data, 1):
-        result = process_regex(regex, test_string, i)
-        print(f"Expresión {i}: {regex}")
-        print(f"Cadena de prueba: {test_string}")
-        print(f"Resultado: {result}\n")
+    if args.multi:
+        # Las cadenas se muestran y se verifican a la par, sin guardar los bloques completos
+        if args.workers == 1:
+            blocks = ((regex, *itertools.tee(test_strings)) for regex, test_strings in entries)
+            blocks = ((regex, shown, process_block(regex, checked, i, render, on_metrics, budget))
+                      for i, (regex, shown, checked) in enumerate(blocks, 1))
+        else:
+            blocks, pending = itertools.tee((regex, list(test_strings)) for regex, test_strings in entries)
+            results = process_blocks_batch(pending, workers=args.workers or None,
+                                           chunksize=args.chunksize, render=render,
+                                           on_metrics=on_metrics, budget=budget)
+            blocks = ((regex, test_strings, block_results)
+                      for (regex, test_strings), block_results in zip(blocks, results))
+        
+        for i, (regex, test_strings, results) in enumerate(blocks, 1):
+            print(f"Expresión {i}: {regex}")
+            for test_string, result in zip(test_strings, results):
+                print(f"Cadena de prueba: {test_string}")
+                print(f"Resultado: {result}")
+            print()
+    else:
+        if args.workers == 1:
+            entries = ((regex, test_string, process_regex(regex, test_string, i, render, on_metrics, budget))
+                       for i, (regex, test_string) in enumerate(entries, 1))
+        else:
+            regex_data, pending = itertools.tee(entries)
+            results = process_batch(pending, workers=args.workers or None,
+                                    chunksize=args.chunksize, render=render, on_metrics=on_metrics,
+                                    budget=budget)
+            entries = ((regex, test_string, result)
+                       for (regex, test_string), result in zip(regex_data, results))
+        
+        for i, (regex, test_string, result) in enumerate(entries, 1):
+            print(f"Expresión {i}: {regex}")
+            print(f"Cadena de prueba: {test_string}")
+            print(f"Resultado: {result}\n")
+    
+    if on_metrics is not None:
+        on_metrics.close()
     
-    print("Las visualizaciones de los autómatas se han guardado en el directorio 'automata_images'")
+    if render:
+        print("Las visualizaciones de los autómatas se han guardado en el directorio 'automata_images'")
 
 if __name__ == "__main__":
     main()
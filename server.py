@@ -0,0 +1,225 @@
+"""
+Servidor asyncio de larga duración para compilar expresiones regulares y verificar cadenas.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea, con el mismo 'id'
+que la petición (las respuestas pueden llegar en otro orden). Operaciones:
+    
+    {"id": 1, "op": "compile", "pattern": "(a|b)*abb"}
+        -> {"id": 1, "ok": true, "engine": "dfa", "states": 4}
+    {"id": 2, "op": "match", "pattern": "(a|b)*abb", "string": "aabb"}
+        -> {"id": 2, "ok": true, "match": true}
+    {"id": 3, "op": "match_batch", "pattern": "(a|b)*abb", "strings": ["abb", "ab"]}
+        -> {"id": 3, "ok": true, "matches": [true, false]}
+
+Los errores se responden como {"id": ..., "ok": false, "error": "..."}.
+
+Los autómatas compilados se guardan en una caché LRU indexada por la forma postfix de la
+expresión. Las compilaciones se ejecutan en un ProcessPoolExecutor para no bloquear el
+bucle de eventos, y las peticiones 'match' concurrentes sobre el mismo patrón se agrupan
+en un solo lote por iteración del bucle.
+
+Si el AFD de una expresión supera el presupuesto de determinización, el patrón se atiende
+con el motor de respaldo de main.fallback_matcher ('glushkov' o 'lazy_dfa'), que se
+construye en el proceso principal porque su costo es lineal en el tamaño de la expresión.
+La respuesta de 'compile' indica el motor en 'engine' y solo incluye 'states' para 'dfa'.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import multiprocessing
+
+from main import build_prefilter, compile_matcher, fallback_matcher, regex_to_postfix
+from automata.budget import DeterminizationBudgetExceeded
+from automata.cache import LRUCache
+from automata.compiled_dfa import CompiledDFA
+from automata.serialization import dumps, loads
+
+# A partir de este tamaño los lotes se verifican con match_many (NumPy)
+BATCH_THRESHOLD = 64
+
+def _compile_serialized(regex):
+    """Compila una expresión en un proceso de trabajo y retorna el AFD compilado serializado"""
+    return dumps(compile_matcher(regex))
+
+def _match_all(compiled, strings):
+    """Verifica un lote de cadenas con el AFD compilado o con el motor de respaldo"""
+    if len(strings) >= BATCH_THRESHOLD and isinstance(compiled, CompiledDFA):
+        return compiled.match_many(strings).tolist()
+    return [compiled.match(string) for string in strings]
+
+class MatchServer:
+    """Estado del servidor: caché de autómatas, compilaciones en curso y lotes pendientes"""
+    def __init__(self, cache_size=256, workers=None):
+        self.automata = LRUCache(maxsize=cache_size)
+        # Los procesos se crean con 'spawn' para que no hereden los sockets abiertos del servidor
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self._compiling = {}  # postfix -> tarea de la compilación en curso
+        self._pending = {}    # postfix -> lista de (cadena, Future) por verificar
+    
+    async def get_compiled(self, pattern):
+        """
+        Retorna (postfix, nombre del motor, matcher) de una expresión, compilándola en el
+        executor si hace falta
+        """
+        postfix = regex_to_postfix(pattern)
+        engine = self.automata.get(postfix)
+        if engine is not None:
+            return (postfix,) + engine
+        
+        # Varias peticiones del mismo patrón esperan a una sola compilación
+        task = self._compiling.get(postfix)
+        if task is None:
+            task = asyncio.ensure_future(self._compile(postfix, pattern))
+            self._compiling[postfix] = task
+        return (postfix,) + await task
+    
+    async def _compile(self, postfix, pattern):
+        """
+        Compila una expresión en el executor y guarda (nombre del motor, matcher) en la caché.
+        Si el AFD supera el presupuesto se usa el motor de respaldo.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            compiled = loads(await loop.run_in_executor(self.executor, _compile_serialized, pattern))
+            # El prefiltro no viaja en el formato serializado; se recalcula en el proceso principal
+            compiled.prefilter = build_prefilter(postfix)
+            engine = ('dfa', compiled)
+        except DeterminizationBudgetExceeded:
+            engine = fallback_matcher(pattern)
+        finally:
+            del self._compiling[postfix]
+        self.automata.put(postfix, engine)
+        return engine
+    
+    async def match(self, pattern, string):
+        """Verifica una cadena, agrupándola con las demás peticiones del mismo patrón"""
+        postfix, _, compiled = await self.get_compiled(pattern)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        batch = self._pending.get(postfix)
+        if batch is None:
+            batch = self._pending[postfix] = []
+            loop.call_soon(self._flush, postfix, compiled)
+        batch.append((string, future))
+        
+        return await future
+    
+    def _flush(self, postfix, compiled):
+        """Verifica en un solo lote las cadenas acumuladas para un patrón"""
+        batch = self._pending.pop(postfix)
+        try:
+            results = _match_all(compiled, [string for string, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(bool(result))
+    
+    async def handle_request(self, request):
+        """Atiende una petición ya decodificada y retorna el diccionario de respuesta"""
+        op = request.get('op')
+        pattern = request.get('pattern')
+        if not isinstance(pattern, str):
+            raise ValueError("Falta el campo 'pattern'")
+        
+        if op == 'compile':
+            _, engine, compiled = await self.get_compiled(pattern)
+            if engine == 'dfa':
+                return {'engine': engine, 'states': compiled.num_states}
+            return {'engine': engine}
+        if op == 'match':
+            string = request.get('string')
+            if not isinstance(string, str):
+                raise ValueError("Falta el campo 'string'")
+            return {'match': await self.match(pattern, string)}
+        if op == 'match_batch':
+            strings = request.get('strings')
+            if not isinstance(strings, list) or not all(isinstance(s, str) for s in strings):
+                raise ValueError("El campo 'strings' debe ser una lista de cadenas")
+            _, _, compiled = await self.get_compiled(pattern)
+            return {'matches': [bool(result) for result in _match_all(compiled, strings)]}
+        
+        raise ValueError(f"Operación desconocida: {op}")
+    
+    async def _respond(self, line, writer):
+        """Decodifica una línea, la atiende y escribe la respuesta"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+            request_id = request.get('id')
+            response = {'id': request_id, 'ok': True}
+            response.update(await self.handle_request(request))
+        except Exception as e:
+            response = {'id': request_id, 'ok': False, 'error': str(e)}
+        
+        if not writer.is_closing():
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+    
+    async def handle_connection(self, reader, writer):
+        """Atiende una conexión; cada línea se procesa como una tarea independiente"""
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    async def serve(self, socket_path=None, host='127.0.0.1', port=8765):
+        """Inicia el servidor en un socket UNIX (si se indica) o en TCP local"""
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        
+        async with server:
+            await server.serve_forever()
+    
+    def close(self):
+        """Libera los procesos de compilación"""
+        self.executor.shutdown()
+
+def parse_args(argv=None):
+    """Interpreta los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor de expresiones regulares (JSON lines)")
+    parser.add_argument('--socket', metavar='RUTA',
+                        help="Escuchar en un socket UNIX en lugar de TCP")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección TCP (por defecto 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Puerto TCP (por defecto 8765)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Número de procesos para compilar (por defecto todos los núcleos)")
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help="Número máximo de autómatas compilados en memoria")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+    server = MatchServer(cache_size=args.cache_size, workers=args.workers)
+    try:
+        asyncio.run(server.serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()